@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
 from typing import Iterable, Sequence
 
 from rich import box
@@ -104,7 +105,40 @@ class ConsoleOutput:
         self._console.print(table)
 
 
+class BufferedOutput:
+    """
+    Records console calls made by a worker thread so they can be replayed
+    as one uninterrupted block by the thread that owns the real console.
+    """
+
+    def __init__(self):
+        self._calls = []
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or not callable(getattr(ConsoleOutput, name, None)):
+            raise AttributeError(name)
+
+        def record(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+
+        return record
+
+    def replay(self, console: ConsoleOutput):
+        for name, args, kwargs in self._calls:
+            getattr(console, name)(*args, **kwargs)
+
+
 _console = ConsoleOutput()
+_thread_state = threading.local()
+
+
+def run_buffered(buffer: BufferedOutput, func, *args, **kwargs):
+    """Call func with get_console() returning `buffer` in the current thread."""
+    _thread_state.console = buffer
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _thread_state.console = None
 
 
 def configure_console(no_color: bool | None = None):
@@ -114,4 +148,4 @@ def configure_console(no_color: bool | None = None):
 
 
 def get_console() -> ConsoleOutput:
-    return _console
+    return getattr(_thread_state, "console", None) or _console
@@ -8,8 +8,13 @@ Contains common functionality used by both the downloader and LRC generator:
 """
 
 import re
+from collections.abc import Iterator
+from functools import lru_cache
+
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import unquote
+from urllib3.util.retry import Retry
 
 try:
     from .console import get_console
@@ -19,6 +24,42 @@ except ImportError:
 # Mixcloud GraphQL API endpoint
 GRAPHQL_URL = "https://app.mixcloud.com/graphql"
 
+# Browser-origin headers sent with user/playlist GraphQL queries
+GRAPHQL_HEADERS = {
+    "origin": "https://www.mixcloud.com",
+    "referer": "https://www.mixcloud.com/"
+}
+
+# Username and slug path segments of a Mixcloud cloudcast URL
+_MIXCLOUD_RE = re.compile(r"mixcloud\.com/([^/]+)/([^/]+)")
+
+
+class MixcloudAPIError(Exception):
+    """Raised by streaming fetchers when the API returns an error response."""
+
+
+def _create_session() -> requests.Session:
+    """
+    Create the shared HTTP session used for all GraphQL requests.
+    
+    Reusing one session keeps TCP/TLS connections alive across paginated and
+    concurrent requests. Transient failures (429/5xx) are retried with backoff;
+    GraphQL queries are read-only, so retrying POST is safe.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False,
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+    return session
+
+
+_SESSION = _create_session()
+
 # GraphQL query for fetching tracklist/sections
 TRACKLIST_QUERY = """
 query Tracklist($lookup: CloudcastLookup!) {
@@ -97,6 +138,7 @@ query PlaylistItems($lookup: PlaylistLookup!, $first: Int!, $after: String) {
 """
 
 
+@lru_cache(maxsize=1024)
 def extract_lookup(url: str) -> tuple[str | None, str | None]:
     """
     Parse a Mixcloud URL to extract username and slug.
@@ -112,12 +154,15 @@ def extract_lookup(url: str) -> tuple[str | None, str | None]:
     Example:
         >>> extract_lookup("https://www.mixcloud.com/DJ/cool-mix/")
         ("DJ", "cool-mix")
+    
+    Results are memoized: the downloader derives the archive ID and the
+    LRC step the tracklist lookup from the same URL.
     """
-    m = re.search(r"mixcloud\.com/([^/]+)/([^/]+)/?", url)
+    m = _MIXCLOUD_RE.search(url)
     if not m:
         return None, None
     # URL-decode the username and slug (handles special characters like æ, ø, etc.)
-    return unquote(m.group(1)), unquote(m.group(2))
+    return unquote(m[1]), unquote(m[2])
 
 
 def format_lrc_timestamp(seconds: float) -> str:
@@ -134,9 +179,10 @@ def format_lrc_timestamp(seconds: float) -> str:
         >>> format_lrc_timestamp(65.5)
         "[01:05.50]"
     """
-    m = int(seconds // 60)
-    s = seconds % 60
-    return f"[{m:02d}:{s:05.2f}]"
+    # Work in whole centiseconds so rounding can carry into the minutes
+    m, cs = divmod(round(seconds * 100), 6000)
+    s, cs = divmod(cs, 100)
+    return f"[{m:02d}:{s:02d}.{cs:02d}]"
 
 
 def fetch_tracklist(username: str, slug: str) -> list[dict] | None:
@@ -157,7 +203,7 @@ def fetch_tracklist(username: str, slug: str) -> list[dict] | None:
         Returns None if cloudcast not found or API error.
     """
     try:
-        resp = requests.post(
+        resp = _SESSION.post(
             GRAPHQL_URL,
             json={
                 "query": TRACKLIST_QUERY,
@@ -205,7 +251,7 @@ def fetch_user_playlists(username: str) -> list[dict] | None:
     
     try:
         while True:
-            resp = requests.post(
+            resp = _SESSION.post(
                 GRAPHQL_URL,
                 json={
                     "query": USER_PLAYLISTS_QUERY,
@@ -215,10 +261,7 @@ def fetch_user_playlists(username: str) -> list[dict] | None:
                         "after": after_cursor
                     }
                 },
-                headers={
-                    "origin": "https://www.mixcloud.com",
-                    "referer": "https://www.mixcloud.com/"
-                },
+                headers=GRAPHQL_HEADERS,
                 timeout=30
             )
             
@@ -236,12 +279,13 @@ def fetch_user_playlists(username: str) -> list[dict] | None:
             playlists_data = user_data.get("playlists", {})
             edges = playlists_data.get("edges", [])
             
-            for edge in edges:
-                node = edge.get("node", {})
-                all_playlists.append({
+            all_playlists.extend(
+                {
                     "name": node.get("name", "Unknown"),
                     "slug": node.get("slug", "")
-                })
+                }
+                for node in (edge.get("node", {}) for edge in edges)
+            )
             
             # Check for more pages
             page_info = playlists_data.get("pageInfo", {})
@@ -257,6 +301,70 @@ def fetch_user_playlists(username: str) -> list[dict] | None:
         return None
 
 
+def iter_user_upload_pages(username: str) -> Iterator[list[dict]]:
+    """
+    Yield uploads (cloudcasts) for a Mixcloud user one API page at a time.
+    
+    Each page is yielded as soon as it arrives, so callers can start working
+    on early uploads while later pages are still being fetched.
+    
+    Args:
+        username: Mixcloud username
+    
+    Yields:
+        Lists of upload dicts (same keys as fetch_user_uploads)
+    
+    Raises:
+        MixcloudAPIError: On a non-200 response or if the user is not found
+        requests.RequestException: On network errors
+    """
+    after_cursor = None
+    
+    while True:
+        resp = _SESSION.post(
+            GRAPHQL_URL,
+            json={
+                "query": USER_UPLOADS_QUERY,
+                "variables": {
+                    "lookup": {"username": username},
+                    "first": 50,
+                    "after": after_cursor
+                }
+            },
+            headers=GRAPHQL_HEADERS,
+            timeout=30
+        )
+        
+        if resp.status_code != 200:
+            raise MixcloudAPIError(f"API error: HTTP {resp.status_code}")
+        
+        data = resp.json()
+        user_data = data.get("data", {}).get("userLookup")
+        
+        if user_data is None:
+            raise MixcloudAPIError(f"User not found on Mixcloud: {username}")
+        
+        uploads_data = user_data.get("uploads", {})
+        edges = uploads_data.get("edges", [])
+        
+        yield [
+            {
+                "name": node.get("name", "Unknown"),
+                "slug": node.get("slug", ""),
+                "url": node.get("url"),
+                "owner_username": None,
+            }
+            for node in (edge.get("node", {}) for edge in edges)
+        ]
+        
+        # Check for more pages
+        page_info = uploads_data.get("pageInfo", {})
+        if page_info.get("hasNextPage"):
+            after_cursor = page_info.get("endCursor")
+        else:
+            break
+
+
 def fetch_user_uploads(username: str) -> list[dict] | None:
     """
     Fetch all uploads (cloudcasts) for a Mixcloud user via GraphQL API.
@@ -273,60 +381,11 @@ def fetch_user_uploads(username: str) -> list[dict] | None:
         
         Returns None if user not found or API error.
     """
-    all_uploads = []
-    after_cursor = None
-    
     try:
-        while True:
-            resp = requests.post(
-                GRAPHQL_URL,
-                json={
-                    "query": USER_UPLOADS_QUERY,
-                    "variables": {
-                        "lookup": {"username": username},
-                        "first": 50,
-                        "after": after_cursor
-                    }
-                },
-                headers={
-                    "origin": "https://www.mixcloud.com",
-                    "referer": "https://www.mixcloud.com/"
-                },
-                timeout=30
-            )
-            
-            if resp.status_code != 200:
-                get_console().error(f"API error: HTTP {resp.status_code}")
-                return None
-            
-            data = resp.json()
-            user_data = data.get("data", {}).get("userLookup")
-            
-            if user_data is None:
-                get_console().error(f"User not found on Mixcloud: {username}")
-                return None
-            
-            uploads_data = user_data.get("uploads", {})
-            edges = uploads_data.get("edges", [])
-            
-            for edge in edges:
-                node = edge.get("node", {})
-                all_uploads.append({
-                    "name": node.get("name", "Unknown"),
-                    "slug": node.get("slug", ""),
-                    "url": node.get("url"),
-                    "owner_username": None,
-                })
-            
-            # Check for more pages
-            page_info = uploads_data.get("pageInfo", {})
-            if page_info.get("hasNextPage"):
-                after_cursor = page_info.get("endCursor")
-            else:
-                break
-        
-        return all_uploads
-    
+        return [upload for page in iter_user_upload_pages(username) for upload in page]
+    except MixcloudAPIError as e:
+        get_console().error(str(e))
+        return None
     except requests.RequestException as e:
         get_console().error(f"Network error: {e}")
         return None
@@ -354,7 +413,7 @@ def fetch_playlist_items(username: str, playlist_slug: str) -> list[dict] | None
     
     try:
         while True:
-            resp = requests.post(
+            resp = _SESSION.post(
                 GRAPHQL_URL,
                 json={
                     "query": PLAYLIST_ITEMS_QUERY,
@@ -364,10 +423,7 @@ def fetch_playlist_items(username: str, playlist_slug: str) -> list[dict] | None
                         "after": after_cursor
                     }
                 },
-                headers={
-                    "origin": "https://www.mixcloud.com",
-                    "referer": "https://www.mixcloud.com/"
-                },
+                headers=GRAPHQL_HEADERS,
                 timeout=30
             )
             
@@ -385,14 +441,15 @@ def fetch_playlist_items(username: str, playlist_slug: str) -> list[dict] | None
             items_data = playlist_data.get("items", {})
             edges = items_data.get("edges", [])
             
-            for edge in edges:
-                cloudcast = edge.get("node", {}).get("cloudcast")
-                if cloudcast is None:
-                    continue  # Skip items with null cloudcast (e.g., deleted tracks)
-                all_items.append({
+            # Skip items with null cloudcast (e.g., deleted tracks)
+            all_items.extend(
+                {
                     "name": cloudcast.get("name", "Unknown"),
                     "slug": cloudcast.get("slug", "")
-                })
+                }
+                for edge in edges
+                if (cloudcast := edge.get("node", {}).get("cloudcast")) is not None
+            )
             
             # Check for more pages
             page_info = items_data.get("pageInfo", {})
@@ -12,24 +12,37 @@ This avoids upsampling low-quality AAC sources to unnecessarily large MP3 files.
 
 import sys
 import argparse
+import threading
 from pathlib import Path
 from datetime import date
 
-import yt_dlp
-from yt_dlp.utils import sanitize_filename
-
 # Import LRC generation from sibling module
 # Handle both direct execution and module import
 try:
     from .mixcloud_match_to_lrc import process_mp3, process_audio_with_url
-    from .mixcloud_common import fetch_user_playlists, fetch_user_uploads
+    from .mixcloud_common import fetch_user_playlists, fetch_user_uploads, extract_lookup
     from .console import configure_console, get_console
 except ImportError:
     from mixcloud_match_to_lrc import process_mp3, process_audio_with_url
-    from mixcloud_common import fetch_user_playlists, fetch_user_uploads
+    from mixcloud_common import fetch_user_playlists, fetch_user_uploads, extract_lookup
     from console import configure_console, get_console
 
 
+def __getattr__(name: str):
+    """
+    Import yt-dlp on first access to ``mixcloud_downloader.yt_dlp``.
+    
+    yt-dlp takes ~150ms to import, so the functions below import it locally
+    and the module-level name is only bound when something (e.g. a test
+    patching ``mixcloud_downloader.yt_dlp.YoutubeDL``) asks for it.
+    """
+    if name == 'yt_dlp':
+        import yt_dlp
+        globals()['yt_dlp'] = yt_dlp
+        return yt_dlp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Shared yt-dlp options for quiet extraction without downloading
 _YTDLP_QUIET_OPTS: dict = {
     'quiet': True,
@@ -41,6 +54,43 @@ _YTDLP_FLAT_OPTS: dict = {
     'extract_flat': 'in_playlist',
 }
 
+# Per-thread YoutubeDL instances for extraction-only calls. Building one costs
+# ~70ms (option parsing, extractor setup), and instances aren't thread-safe,
+# so each thread (e.g. the orphan info prefetcher's workers) keeps its own.
+# Every instance is also recorded so close_extraction_ydls() can release them.
+_YDL_CACHE = threading.local()
+_YDL_OPEN: list = []
+_YDL_LOCK = threading.Lock()
+
+
+def _extraction_ydl(name: str, opts: dict):
+    """Return this thread's reusable YoutubeDL for extraction-only `opts`."""
+    import yt_dlp
+
+    ydl = getattr(_YDL_CACHE, name, None)
+    if ydl is None:
+        ydl = yt_dlp.YoutubeDL(opts)
+        setattr(_YDL_CACHE, name, ydl)
+        with _YDL_LOCK:
+            _YDL_OPEN.append(ydl)
+    return ydl
+
+
+def close_extraction_ydls() -> None:
+    """
+    Close every cached extraction YoutubeDL, in all threads.
+    
+    Call once the threads using them are done (e.g. after a worker pool has
+    shut down); later extraction calls build fresh instances.
+    """
+    global _YDL_CACHE
+    with _YDL_LOCK:
+        opened = _YDL_OPEN[:]
+        _YDL_OPEN.clear()
+        _YDL_CACHE = threading.local()
+    for ydl in opened:
+        ydl.close()
+
 
 def _extract_entries(url: str) -> list[dict]:
     """
@@ -50,11 +100,11 @@ def _extract_entries(url: str) -> list[dict]:
     
     Returns list of entry dicts with 'url', 'title', etc.
     """
-    with yt_dlp.YoutubeDL(_YTDLP_FLAT_OPTS) as ydl:
-        info = ydl.extract_info(url, download=False)
-        if info and 'entries' in info:
-            return [e for e in info['entries'] if e]
-    return []
+    info = _extraction_ydl('flat', _YTDLP_FLAT_OPTS).extract_info(url, download=False)
+    if not info:
+        return []
+    # filter(None, ...) drops unavailable (None) entries in one C-level pass
+    return list(filter(None, info.get('entries') or ()))
 
 
 def get_user_playlists(username: str) -> list[dict]:
@@ -132,6 +182,73 @@ def _is_older_than(info: dict | None, since_date: date | None) -> bool:
         return False
 
 
+def load_download_archive(archive_path: Path) -> set[str]:
+    """
+    Load a yt-dlp download archive file into a set of archive IDs.
+    
+    Returns an empty set if the file does not exist or cannot be read.
+    """
+    try:
+        with open(archive_path, encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+    except OSError:
+        return set()
+
+
+def archive_id_for_url(url: str) -> str | None:
+    """
+    Build the yt-dlp archive ID ("mixcloud <user>_<slug>") for a track URL.
+    
+    Returns None if the URL is not a Mixcloud track URL.
+    """
+    user, slug = extract_lookup(url)
+    if not user or not slug:
+        return None
+    return f"mixcloud {user}_{slug}"
+
+
+def _find_existing_download(expected_path: Path | None, expected_dir: Path | None, upload_date: str | None) -> Path | None:
+    """
+    Locate a previously downloaded file for a track that was not re-downloaded.
+    """
+    console = get_console()
+    if expected_path and expected_path.exists():
+        console.info("  (already exists)")
+        return expected_path
+    # Fallback: glob for file with matching upload_date prefix
+    if expected_dir and expected_dir.exists() and upload_date:
+        pattern = f"{upload_date} - *"
+        matches = list(expected_dir.glob(pattern))
+        if matches:
+            console.info(f"  (found existing: {matches[0].name})")
+            return matches[0]
+        else:
+            console.warn(f"  (no matching file found for {upload_date})")
+    return None
+
+
+def _run_download(ydl, url: str, info: dict | None) -> None:
+    """
+    Download a track, reusing already-extracted metadata when available.
+    
+    Passing the info dict to yt-dlp (as --load-info-json does) skips a second
+    extraction of the same URL. Falls back to a fresh extraction if the
+    cached metadata can no longer be downloaded.
+    """
+    import yt_dlp
+
+    if not info:
+        ydl.download([url])
+        return
+    try:
+        ydl.process_ie_result(ydl.sanitize_info(info, remove_private_keys=True), download=True)
+    except yt_dlp.utils.DownloadError as e:
+        if 'already been recorded' in str(e):
+            raise
+        get_console().warn("  Warning: Cached track info failed; re-extracting from URL")
+        ydl.download([url])
+
+
 def get_playlist_entries(playlist_url: str) -> list[dict]:
     """
     Get all track entries from a playlist.
@@ -152,11 +269,22 @@ def fetch_track_info(url: str) -> dict | None:
     
     Returns info dict with title, formats, etc. or None on error.
     """
-    with yt_dlp.YoutubeDL(_YTDLP_QUIET_OPTS) as ydl:
-        try:
-            return ydl.extract_info(url, download=False)
-        except Exception as e:
-            get_console().warn(f"  Warning: Could not fetch track info: {e}")
+    try:
+        return _extraction_ydl('quiet', _YTDLP_QUIET_OPTS).extract_info(url, download=False)
+    except Exception as e:
+        get_console().warn(f"  Warning: Could not fetch track info: {e}")
+    return None
+
+
+def _classify_acodec(acodec: str | None) -> str | None:
+    """Map a yt-dlp acodec string to 'opus' or 'aac', or None if neither."""
+    if not acodec:
+        return None
+    acodec = acodec.lower()
+    if 'opus' in acodec:
+        return 'opus'
+    if 'aac' in acodec or 'mp4a' in acodec:
+        return 'aac'
     return None
 
 
@@ -170,24 +298,14 @@ def extract_codec_from_info(info: dict | None) -> str:
     if not info:
         return 'unknown'
     
-    # Check formats for audio codec
-    formats = info.get('formats') or []
-    for fmt in formats:
-        acodec = fmt.get('acodec', '')
-        if acodec and acodec != 'none':
-            if 'opus' in acodec.lower():
-                return 'opus'
-            elif 'aac' in acodec.lower() or 'mp4a' in acodec.lower():
-                return 'aac'
-    
-    # Fallback: check top-level acodec
-    acodec = info.get('acodec', '')
-    if 'opus' in acodec.lower():
-        return 'opus'
-    elif 'aac' in acodec.lower() or 'mp4a' in acodec.lower():
-        return 'aac'
-    
-    return 'unknown'
+    # First format with a recognised audio codec wins (video-only 'none' never matches),
+    # falling back to the top-level acodec
+    formats = info.get('formats') or ()
+    codec = next(
+        (codec for fmt in formats if (codec := _classify_acodec(fmt.get('acodec')))),
+        None,
+    ) or _classify_acodec(info.get('acodec'))
+    return codec or 'unknown'
 
 
 def detect_audio_codec(url: str) -> str:
@@ -201,7 +319,7 @@ def detect_audio_codec(url: str) -> str:
     return extract_codec_from_info(info)
 
 
-def download_track(url: str, output_dir: Path, archive_path: Path, codec: str, playlist_title: str = 'Unknown', info: dict | None = None, to_mp3: bool = False) -> Path | None:
+def download_track(url: str, output_dir: Path, archive_path: Path, codec: str, playlist_title: str = 'Unknown', info: dict | None = None, to_mp3: bool = False, archive: set[str] | None = None) -> Path | None:
     """
     Download a single track with quality settings based on codec.
     
@@ -212,10 +330,16 @@ def download_track(url: str, output_dir: Path, archive_path: Path, codec: str, p
         codec: Detected codec ('opus', 'aac', or 'unknown')
         playlist_title: Name of the playlist (used in output path)
         info: Track info dict (used to calculate expected path)
+        archive: Preloaded archive IDs (see load_download_archive); tracks
+            already in it are skipped without invoking yt-dlp, and new
+            downloads are added to it
     
     Returns:
         Path to audio file (downloaded or existing), or None if failed
     """
+    import yt_dlp
+    from yt_dlp.utils import sanitize_filename
+
     console = get_console()
 
     # Quality mapping: opus gets best quality, aac gets medium to avoid bloat
@@ -237,6 +361,11 @@ def download_track(url: str, output_dir: Path, archive_path: Path, codec: str, p
         ext = 'mp3' if to_mp3 else info.get('ext', 'audio')
         expected_path = expected_dir / f"{upload_date} - {safe_title}.{ext}"
     
+    archive_id = archive_id_for_url(url) if archive is not None else None
+    if archive_id and archive_id in archive:
+        console.info("  (already in archive)")
+        return _find_existing_download(expected_path, expected_dir, upload_date)
+    
     ydl_opts = {
         'format': 'bestaudio/best',
         'outtmpl': str(output_dir / f'%(uploader)s/{safe_playlist}/%(upload_date)s - %(title)s.%(ext)s'),
@@ -315,23 +444,14 @@ def download_track(url: str, output_dir: Path, archive_path: Path, codec: str, p
     
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         try:
-            ydl.download([url])
+            _run_download(ydl, url, info)
             # Return the final path (captured by postprocessor hook)
             if downloaded_file and downloaded_file.exists():
+                if archive_id:
+                    archive.add(archive_id)
                 return downloaded_file
             # If no download happened (skipped/archived), try to find existing file
-            if expected_path and expected_path.exists():
-                console.info("  (already exists)")
-                return expected_path
-            # Fallback: glob for file with matching upload_date prefix
-            if expected_dir and expected_dir.exists() and upload_date:
-                pattern = f"{upload_date} - *"
-                matches = list(expected_dir.glob(pattern))
-                if matches:
-                    console.info(f"  (found existing: {matches[0].name})")
-                    return matches[0]
-                else:
-                    console.warn(f"  (no matching file found for {upload_date})")
+            return _find_existing_download(expected_path, expected_dir, upload_date)
         except yt_dlp.utils.DownloadError as e:
             if 'already been recorded' in str(e) or 'has already been downloaded' in str(e).lower():
                 console.info("  (already in archive)")
@@ -346,13 +466,14 @@ def download_track(url: str, output_dir: Path, archive_path: Path, codec: str, p
     return None
 
 
-def download_playlist(playlist_url: str, playlist_title: str, output_dir: Path, archive_path: Path, embed_lyrics: bool = True, write_lrc: bool = False, to_mp3: bool = False, limit: int | None = None, since_date: date | None = None) -> list[Path]:
+def download_playlist(playlist_url: str, playlist_title: str, output_dir: Path, archive_path: Path, embed_lyrics: bool = True, write_lrc: bool = False, to_mp3: bool = False, limit: int | None = None, since_date: date | None = None, archive: set[str] | None = None) -> list[Path]:
     """
     Download all tracks from a playlist with conditional quality.
     
     Args:
         embed_lyrics: If True, embed LRC content as USLT tag (default: True)
         write_lrc: If True, write separate .lrc file (default: False)
+        archive: Preloaded archive IDs shared across downloads
     
     Returns list of paths to successfully downloaded audio files.
     """
@@ -395,7 +516,7 @@ def download_playlist(playlist_url: str, playlist_title: str, output_dir: Path,
             console.print("  Audio: keeping original audio")
         
         # Download with appropriate settings
-        audio_path = download_track(url, output_dir, archive_path, codec, playlist_title, info, to_mp3=to_mp3)
+        audio_path = download_track(url, output_dir, archive_path, codec, playlist_title, info, to_mp3=to_mp3, archive=archive)
         
         if audio_path and audio_path.exists():
             downloaded_files.append(audio_path)
@@ -497,6 +618,9 @@ Transcoding (optional):
     
     processed_uploads = 0
     
+    # Load the archive once; download_track checks membership in memory
+    archive = load_download_archive(args.archive)
+    
     if args.playlists:
         console.info("Fetching playlists...")
         playlists = get_user_playlists(args.username)
@@ -564,7 +688,8 @@ Transcoding (optional):
                 write_lrc=write_lrc,
                 to_mp3=to_mp3,
                 limit=remaining,
-                since_date=since_date
+                since_date=since_date,
+                archive=archive
             )
             all_downloaded.extend(downloaded)
     else:
@@ -628,7 +753,7 @@ Transcoding (optional):
             else:
                 console.print("  Audio: keeping original audio")
             
-            audio_path = download_track(url, args.output, args.archive, codec, "Uploads", info, to_mp3=to_mp3)
+            audio_path = download_track(url, args.output, args.archive, codec, "Uploads", info, to_mp3=to_mp3, archive=archive)
             
             if audio_path and audio_path.exists():
                 all_downloaded.append(audio_path)
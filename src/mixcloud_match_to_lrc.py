@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from mutagen import File
 from mutagen.id3 import ID3, USLT
@@ -8,23 +9,34 @@ from mutagen.oggvorbis import OggVorbis
 # Import shared utilities
 try:
     from .mixcloud_common import extract_lookup, format_lrc_timestamp, fetch_tracklist
-    from .console import configure_console, get_console
+    from .console import BufferedOutput, configure_console, get_console, run_buffered
 except ImportError:
     from mixcloud_common import extract_lookup, format_lrc_timestamp, fetch_tracklist
-    from console import configure_console, get_console
+    from console import BufferedOutput, configure_console, get_console, run_buffered
 
 
-SUPPORTED_AUDIO_EXTS = {".mp3", ".m4a", ".mp4", ".opus", ".ogg", ".oga"}
+SUPPORTED_AUDIO_EXTS = frozenset({".mp3", ".m4a", ".mp4", ".opus", ".ogg", ".oga"})
 
+# Number of files whose tracklists are fetched and embedded concurrently by walk()
+WALK_WORKERS = 4
 
-def _get_tag_value(tags, key: str):
+
+def _lowercase_tag_index(tags) -> dict[str, str]:
+    index = {}
+    for tag_key in tags.keys():
+        index.setdefault(tag_key.lower(), tag_key)
+    return index
+
+
+def _get_tag_value(tags, key: str, lower_index: dict[str, str] | None = None):
     if key in tags:
         return tags[key]
-    key_lower = key.lower()
-    for tag_key in tags.keys():
-        if tag_key.lower() == key_lower:
-            return tags[tag_key]
-    return None
+    if lower_index is None:
+        lower_index = _lowercase_tag_index(tags)
+    tag_key = lower_index.get(key.lower())
+    if tag_key is None:
+        return None
+    return tags[tag_key]
 
 
 def _normalize_tag_value(value) -> str | None:
@@ -44,27 +56,30 @@ def _normalize_tag_value(value) -> str | None:
     return str(value)
 
 
+# Tag keys that may hold the Mixcloud URL, in priority order
+_URL_TAG_KEYS = ("TXXX:purl", "WXXX:purl", "WPUB", "WOAS", "purl", "url", "comment")
+
+
 def extract_mixcloud_url(tags) -> str | None:
     """
     Extract Mixcloud URL from common tag fields.
+    
+    Exact-case keys are probed first; the case-insensitive key index needs a
+    scan of every tag, so it is only built when none of them match.
     """
-    for key in ("TXXX:purl", "WXXX:purl", "WPUB", "WOAS"):
-        value = _get_tag_value(tags, key)
+    for key in _URL_TAG_KEYS:
+        if key in tags:
+            url = _normalize_tag_value(tags[key])
+            if url and "mixcloud.com" in url:
+                return url
+
+    lower_index = _lowercase_tag_index(tags)
+    for key in _URL_TAG_KEYS:
+        value = _get_tag_value(tags, key, lower_index)
         url = _normalize_tag_value(value)
         if url and "mixcloud.com" in url:
             return url
 
-    for key in ("purl", "url"):
-        value = _get_tag_value(tags, key)
-        url = _normalize_tag_value(value)
-        if url and "mixcloud.com" in url:
-            return url
-
-    comment = _get_tag_value(tags, "comment")
-    comment_str = _normalize_tag_value(comment)
-    if comment_str and "mixcloud.com" in comment_str:
-        return comment_str
-
     return None
 
 
@@ -208,7 +223,6 @@ def process_audio_with_url(audio_path: Path, url: str, embed: bool = True, write
         console.warn("  Skipping (unsupported audio format)")
         return
     
-    audio_duration = audio.info.length if hasattr(audio.info, 'length') else None
     user, slug = extract_lookup(url)
     
     if not user or not slug:
@@ -228,7 +242,12 @@ def process_audio_with_url(audio_path: Path, url: str, embed: bool = True, write
         return
 
     timed_sections = [s for s in sections if s.get('startSeconds') is not None]
-    if len(timed_sections) < 2 and audio_duration:
+    if len(timed_sections) < 2:
+        # Duration is only needed for the evenly-spaced fallback
+        audio_duration = getattr(audio.info, 'length', None)
+        if not audio_duration:
+            console.warn("  Skipping (no timing information and no audio duration)")
+            return
         console.info(
             f"  No timing data - calculating evenly-spaced timestamps over "
             f"{int(audio_duration/60)}:{int(audio_duration%60):02d}"
@@ -236,9 +255,6 @@ def process_audio_with_url(audio_path: Path, url: str, embed: bool = True, write
         interval = audio_duration / len(sections)
         for i, s in enumerate(sections):
             s['startSeconds'] = i * interval
-    elif len(timed_sections) < 2:
-        console.warn("  Skipping (no timing information and no audio duration)")
-        return
     
     lrc_content = generate_lrc_content(user, audio_path.stem, sections)
     actions = []
@@ -253,8 +269,8 @@ def process_audio_with_url(audio_path: Path, url: str, embed: bool = True, write
     
     if write_file or fallback_write:
         lrc_path = audio_path.with_suffix(".lrc")
-        with open(lrc_path, "w", encoding="utf-8") as f:
-            f.write(lrc_content)
+        # Encode once and write raw bytes (skips the text-layer encoder)
+        lrc_path.write_bytes(lrc_content.encode("utf-8"))
         actions.append(f"wrote {lrc_path.name}")
     
     action_str = " + ".join(actions)
@@ -299,20 +315,38 @@ def walk(root, embed: bool = True, write_file: bool = False):
     """
     Recursively process supported audio files in directory.
     
+    Each file needs its own tracklist API round trip, so up to WALK_WORKERS
+    files are processed concurrently over the shared HTTP session. Output for
+    each file is buffered and printed under its path once the file is done.
+    
     Args:
         root: Root directory to process
         embed: If True, embed LRC content as USLT tag (default: True)
         write_file: If True, write .lrc file to disk (default: False)
     """
-    for path in Path(root).rglob("*"):
-        if not path.is_file():
-            continue
-        if path.suffix.lower() not in SUPPORTED_AUDIO_EXTS:
-            continue
-        try:
-            process_audio_from_tags(path, embed=embed, write_file=write_file)
-        except Exception as e:
-            get_console().error(f"Error on {path}: {e}")
+    exts = SUPPORTED_AUDIO_EXTS
+    paths = (
+        path for path in Path(root).rglob("*")
+        if path.is_file() and path.suffix.lower() in exts
+    )
+    console = get_console()
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as executor:
+        futures = {}
+        for path in paths:
+            output = BufferedOutput()
+            future = executor.submit(
+                run_buffered, output, process_audio_from_tags, path,
+                embed=embed, write_file=write_file,
+            )
+            futures[future] = (path, output)
+        for future in as_completed(futures):
+            path, output = futures[future]
+            console.print(str(path))
+            output.replay(console)
+            try:
+                future.result()
+            except Exception as e:
+                console.error(f"Error on {path}: {e}")
 
 
 if __name__ == "__main__":
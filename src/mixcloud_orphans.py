@@ -13,41 +13,105 @@ Options:
     --to-mp3        Transcode audio to MP3 (default: keep original container)
     --no-embed      Skip embedding lyrics in MP3 tags
     --write-lrc     Write separate .lrc files
+    --cache-ttl S   Reuse cached playlist contents younger than S seconds
 """
 
 import argparse
+import json
+import os
 import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import requests
+
 # Import shared utilities
 try:
     from .mixcloud_common import (
+        MixcloudAPIError,
         fetch_user_playlists,
         fetch_user_uploads,
         fetch_playlist_items,
+        iter_user_upload_pages,
     )
-    from .console import configure_console, get_console
+    from .console import BufferedOutput, configure_console, get_console, run_buffered
 except ImportError:
     from mixcloud_common import (
+        MixcloudAPIError,
         fetch_user_playlists,
         fetch_user_uploads,
         fetch_playlist_items,
+        iter_user_upload_pages,
     )
-    from console import configure_console, get_console
+    from console import BufferedOutput, configure_console, get_console, run_buffered
+
+
+# Maximum number of playlist item requests in flight at once
+PLAYLIST_FETCH_WORKERS = 8
+
+# Number of upcoming tracks whose metadata is fetched while downloading
+INFO_PREFETCH_AHEAD = 4
+
+# Number of downloaded tracks whose tracklists are embedded in the background
+TRACKLIST_WORKERS = 2
 
+# On-disk cache of playlist contents. Every run refreshes it; entries are only
+# reused when --cache-ttl opts in, since playlists may have changed since
+PLAYLIST_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "mixcloud-backup" / "playlists.json"
+)
 
-def find_orphan_tracks(username: str) -> tuple[list[dict], list[dict], set[str]] | None:
+
+def _load_playlist_cache(cache_path: Path) -> dict:
     """
-    Find tracks that don't belong to any playlist.
+    Load the playlist cache, returning an empty cache if missing or corrupt.
+    
+    Layout: {username: {playlist_slug: {"fetched_at": float, "slugs": [str]}}}
+    """
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_playlist_cache(cache_path: Path, cache: dict) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(cache), encoding="utf-8")
+        tmp_path.replace(cache_path)
+    except OSError as e:
+        get_console().warn(f"  Warning: Could not write playlist cache: {e}")
+
+
+def _attach_url(track: dict, username: str) -> dict:
+    """Store the track's Mixcloud URL under '_url' so it is built only once."""
+    track['_url'] = track.get('url') or f"https://www.mixcloud.com/{track.get('owner_username') or username}/{track['slug']}/"
+    return track
+
+
+def collect_playlist_slugs(
+    username: str,
+    cache_path: Path | None = None,
+    cache_ttl: float = 0,
+) -> frozenset[str] | None:
+    """
+    Collect the slugs of every track that belongs to one of the user's playlists.
     
     Args:
         username: Mixcloud username
+        cache_path: Optional JSON file caching playlist contents between runs;
+            playlists fetched less than `cache_ttl` seconds ago are not re-fetched
+        cache_ttl: Maximum age in seconds of a reusable cache entry; 0 (the
+            default) always re-fetches and never falls back to cached items
     
     Returns:
-        Tuple of (all_uploads, orphan_tracks, playlist_slugs) or None on error
-        - all_uploads: List of all upload dicts
-        - orphan_tracks: List of upload dicts not in any playlist
-        - playlist_slugs: Set of slugs that are in playlists
+        Frozen set of slugs that are in playlists, or None on error
     """
     console = get_console()
     console.info(f"Fetching playlists for {username}...")
@@ -56,33 +120,318 @@ def find_orphan_tracks(username: str) -> tuple[list[dict], list[dict], set[str]]
         return None
     console.info(f"  Found {len(playlists)} playlists")
     
-    # Collect all tracks from all playlists
-    playlist_slugs = set()
-    for i, playlist in enumerate(playlists, 1):
-        console.print(f"  [{i}/{len(playlists)}] Fetching items from '{playlist['name']}'...")
+    cache = _load_playlist_cache(cache_path) if cache_path else {}
+    user_cache = cache.get(username) or {}
+    now = time.time()
+    
+    def fetch_entry(playlist: dict) -> tuple[dict | None, str]:
+        cached = user_cache.get(playlist['slug'])
+        if cached and now - cached.get('fetched_at', 0) < cache_ttl:
+            return cached, "cached"
         items = fetch_playlist_items(username, playlist['slug'])
-        if items:
-            for item in items:
-                playlist_slugs.add(item['slug'])
+        if items is None:
+            # With caching enabled, expired slugs beat none: dropping them
+            # would report the playlist's tracks as orphans
+            return (cached if cache_ttl > 0 else None), "fetch failed"
+        return {'fetched_at': now, 'slugs': [item['slug'] for item in items]}, "fetched"
+    
+    # Collect all tracks from all playlists (requests are issued concurrently,
+    # results are consumed in playlist order)
+    playlist_slugs = set()
+    updated_cache = {}
+    with ThreadPoolExecutor(max_workers=PLAYLIST_FETCH_WORKERS) as executor:
+        results = executor.map(fetch_entry, playlists)
+        for i, (playlist, (entry, source)) in enumerate(zip(playlists, results), 1):
+            console.print(f"  [{i}/{len(playlists)}] Items from '{playlist['name']}' ({source})")
+            if source == "fetch failed" and entry:
+                console.warn(f"  Warning: Using stale cached items for '{playlist['name']}'")
+            elif source == "fetch failed":
+                console.warn(f"  Warning: Could not fetch items; tracks in '{playlist['name']}' may be listed as orphans")
+            if entry:
+                playlist_slugs.update(entry['slugs'])
+                updated_cache[playlist['slug']] = entry
+    
+    if cache_path:
+        # Rewriting the user's entry also drops playlists that no longer exist
+        cache[username] = updated_cache
+        _save_playlist_cache(cache_path, cache)
     
     console.info(f"  Total tracks in playlists: {len(playlist_slugs)}")
+    return frozenset(playlist_slugs)
+
+
+def iter_orphan_tracks(
+    username: str,
+    playlist_slugs: frozenset[str],
+    counts: dict | None = None,
+) -> Iterator[dict]:
+    """
+    Yield uploads that are not in any playlist as upload pages arrive.
+    
+    Unlike find_orphan_tracks, orphans on the first upload page are available
+    before the remaining pages have been fetched.
+    
+    Args:
+        username: Mixcloud username
+        playlist_slugs: Slugs of tracks that are in a playlist
+        counts: Optional dict whose 'uploads' and 'orphans' totals are kept
+            up to date as the uploads are consumed
+    
+    Raises:
+        MixcloudAPIError: On an API error response
+        requests.RequestException: On network errors
+    """
+    if counts is None:
+        counts = {}
+    counts.update(uploads=0, orphans=0)
+    # Pages may overlap, so slugs already seen are skipped
+    seen = set()
+    for page in iter_user_upload_pages(username):
+        for upload in page:
+            slug = upload['slug']
+            if slug in seen:
+                continue
+            seen.add(slug)
+            counts['uploads'] += 1
+            if slug not in playlist_slugs:
+                counts['orphans'] += 1
+                yield _attach_url(upload, username)
+
+
+def find_orphan_tracks(
+    username: str,
+    cache_path: Path | None = None,
+    cache_ttl: float = 0,
+) -> tuple[list[dict], list[dict], frozenset[str]] | None:
+    """
+    Find tracks that don't belong to any playlist.
+    
+    Args:
+        username: Mixcloud username
+        cache_path: Optional JSON file caching playlist contents between runs;
+            playlists fetched less than `cache_ttl` seconds ago are not re-fetched
+        cache_ttl: Maximum age in seconds of a reusable cache entry; 0 (the
+            default) always re-fetches and never falls back to cached items
+    
+    Returns:
+        Tuple of (all_uploads, orphan_tracks, playlist_slugs) or None on error
+        - all_uploads: List of all upload dicts
+        - orphan_tracks: List of upload dicts not in any playlist, each with
+          its Mixcloud URL under '_url'
+        - playlist_slugs: Frozen set of slugs that are in playlists
+    """
+    playlist_slugs = collect_playlist_slugs(username, cache_path=cache_path, cache_ttl=cache_ttl)
+    if playlist_slugs is None:
+        return None
     
     # Get all uploads
+    console = get_console()
     console.info(f"Fetching all uploads for {username}...")
     all_uploads = fetch_user_uploads(username)
     if all_uploads is None:
         return None
+    # Drop duplicate uploads (overlapping pages) so each is only downloaded once
+    uploads_by_slug = {upload['slug']: upload for upload in all_uploads}
+    all_uploads = list(uploads_by_slug.values())
     console.info(f"  Found {len(all_uploads)} uploads")
     
-    # Find orphans (uploads not in any playlist)
+    # Find orphans (uploads not in any playlist), keeping upload order
     orphan_tracks = [
-        upload for upload in all_uploads
-        if upload['slug'] not in playlist_slugs
+        _attach_url(upload, username)
+        for slug, upload in uploads_by_slug.items()
+        if slug not in playlist_slugs
     ]
     
     return all_uploads, orphan_tracks, playlist_slugs
 
 
+def prefetch_track_info(
+    items: Iterable[tuple[dict, str]],
+    fetch_info,
+    ahead: int = INFO_PREFETCH_AHEAD,
+) -> Iterator[tuple[dict, str, dict | None, BufferedOutput]]:
+    """
+    Yield (track, url, info, output) while fetching metadata for upcoming tracks.
+    
+    Keeps at most `ahead` metadata requests in flight, so info for the next
+    tracks is already available when the current download finishes. `items`
+    may be a lazy iterator; it is only advanced `ahead` entries at a time. If
+    it raises, tracks already queued are yielded before the error propagates.
+    
+    Console output from each fetch is buffered in `output`, so the consumer
+    can replay it under that track's own header.
+    
+    Args:
+        items: (track, url) pairs in download order
+        fetch_info: Callable returning the info dict for a URL (or None)
+        ahead: Number of URLs to fetch ahead of the consumer
+    """
+    item_iter = iter(items)
+    source_error = None
+    with ThreadPoolExecutor(max_workers=ahead) as executor:
+        pending = deque()
+        
+        def submit_next() -> None:
+            nonlocal source_error
+            if source_error is not None:
+                return
+            try:
+                item = next(item_iter, None)
+            except Exception as e:
+                source_error = e
+                return
+            if item is not None:
+                track, url = item
+                output = BufferedOutput()
+                future = executor.submit(run_buffered, output, fetch_info, url)
+                pending.append((track, url, future, output))
+        
+        for _ in range(ahead):
+            submit_next()
+        while pending:
+            track, url, future, output = pending.popleft()
+            submit_next()
+            yield track, url, future.result(), output
+    
+    if source_error is not None:
+        raise source_error
+
+
+def download_orphans(orphan_tracks: Iterable[dict], args: argparse.Namespace) -> bool:
+    """
+    Download orphan tracks and process their tracklists.
+    
+    `orphan_tracks` is consumed lazily, so downloads start while later upload
+    pages are still being fetched.
+    
+    Returns:
+        True if the orphan listing was consumed completely, False on API error
+    """
+    console = get_console()
+    
+    # Imported here so listing orphans never loads yt-dlp or mutagen
+    try:
+        from .mixcloud_downloader import (
+            close_extraction_ydls,
+            fetch_track_info,
+            extract_codec_from_info,
+            download_track,
+            load_download_archive,
+        )
+        from .mixcloud_match_to_lrc import process_mp3, process_audio_with_url
+    except ImportError:
+        from mixcloud_downloader import (
+            close_extraction_ydls,
+            fetch_track_info,
+            extract_codec_from_info,
+            download_track,
+            load_download_archive,
+        )
+        from mixcloud_match_to_lrc import process_mp3, process_audio_with_url
+    
+    downloaded_count = 0
+    orphan_count = 0
+    completed = True
+    
+    # Load the archive once; download_track checks membership in memory
+    archive = load_download_archive(args.archive)
+    
+    orphan_urls = ((track, track['_url']) for track in orphan_tracks)
+    # Track info for upcoming orphans is fetched while the current one downloads
+    prefetched = prefetch_track_info(orphan_urls, fetch_track_info)
+    
+    embed_lyrics = not args.no_embed
+    write_lrc = args.write_lrc
+    
+    # Tracklist embedding runs in the background so the next download can start.
+    # Each job's output is buffered and printed in one block once it finishes,
+    # so it never lands unattributed under a later track's header.
+    with ThreadPoolExecutor(max_workers=TRACKLIST_WORKERS) as post_executor:
+        tracklist_jobs = {}
+        queued_paths = set()
+        
+        def report_job(future) -> None:
+            mp3_path, output = tracklist_jobs.pop(future)
+            console.print(f"Tracklist: {mp3_path.name}")
+            output.replay(console)
+            try:
+                future.result()
+            except Exception as e:
+                console.error(f"  Tracklist error ({mp3_path.name}): {e}")
+        
+        try:
+            for orphan_count, (track, url, info, info_output) in enumerate(prefetched, 1):
+                title = info.get('title', track['name']) if info else track['name']
+                codec = extract_codec_from_info(info) if args.to_mp3 else 'unknown'
+                
+                for future in [f for f in tracklist_jobs if f.done()]:
+                    report_job(future)
+                
+                console.print(f"[{orphan_count}] {title}")
+                info_output.replay(console)
+                if args.to_mp3:
+                    quality_desc = "best (opus source)" if codec == 'opus' else "medium (aac source)"
+                    console.print(f"  Codec: {codec} → MP3 quality: {quality_desc}")
+                else:
+                    console.print("  Audio: keeping original audio")
+                
+                # Download with "Orphans" as playlist name
+                mp3_path = download_track(url, args.output, args.archive, codec, "Orphans", info, to_mp3=args.to_mp3, archive=archive)
+                
+                if mp3_path and mp3_path.exists():
+                    downloaded_count += 1
+                    console.success(f"  ✓ Ready: {mp3_path}")
+                    
+                    # Process tracklist (embed/write LRC); two orphans can resolve
+                    # to the same existing file, which must not be written twice
+                    if (embed_lyrics or write_lrc) and mp3_path in queued_paths:
+                        console.info("  Tracklist already queued for this file")
+                    elif embed_lyrics or write_lrc:
+                        queued_paths.add(mp3_path)
+                        console.info("  Processing tracklist...")
+                        output = BufferedOutput()
+                        future = post_executor.submit(
+                            run_buffered, output, process_audio_with_url, mp3_path, url,
+                            embed=embed_lyrics, write_file=write_lrc,
+                        )
+                        tracklist_jobs[future] = (mp3_path, output)
+        except MixcloudAPIError as e:
+            console.error(str(e))
+            completed = False
+        except requests.RequestException as e:
+            console.error(f"Network error: {e}")
+            completed = False
+        
+        for future in as_completed(list(tracklist_jobs)):
+            report_job(future)
+    
+    # The prefetch workers are done; release their cached YoutubeDL instances
+    prefetched.close()
+    close_extraction_ydls()
+    
+    # Final summary
+    console.summary_table(
+        "Download Complete",
+        [
+            ("Orphan tracks found", str(orphan_count)),
+            ("Tracks downloaded", str(downloaded_count)),
+            ("Archive file", str(args.archive)),
+        ],
+    )
+    return completed
+
+
+def _print_summary(upload_count: int, playlist_track_count: int, orphan_count: int) -> None:
+    get_console().summary_table(
+        "Summary",
+        [
+            ("Total uploads", str(upload_count)),
+            ("In playlists", str(playlist_track_count)),
+            ("Orphans", str(orphan_count)),
+        ],
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Find and optionally download orphan Mixcloud tracks.',
@@ -109,6 +458,9 @@ Examples:
                         help='Skip embedding lyrics in MP3 USLT tag')
     parser.add_argument('--write-lrc', action='store_true',
                         help='Write separate .lrc files (default: embed only)')
+    parser.add_argument('--cache-ttl', type=float, default=0, metavar='SECONDS',
+                        help='Reuse cached playlist contents fetched less than SECONDS ago '
+                             '(default: 0, always re-fetch)')
     parser.add_argument('--no-color', action='store_true',
                         help='Disable colored output')
     
@@ -120,100 +472,42 @@ Examples:
     console.print(f"Account: {args.username}")
     console.print()
     
-    result = find_orphan_tracks(args.username)
+    if args.download:
+        # Stream orphans into the downloader as upload pages arrive
+        playlist_slugs = collect_playlist_slugs(args.username, cache_path=PLAYLIST_CACHE_PATH, cache_ttl=args.cache_ttl)
+        if playlist_slugs is None:
+            console.error("Error fetching data from Mixcloud")
+            sys.exit(1)
+        console.rule("Downloading Orphan Tracks")
+        counts = {'uploads': 0, 'orphans': 0}
+        if not download_orphans(iter_orphan_tracks(args.username, playlist_slugs, counts), args):
+            sys.exit(1)
+        # Totals are only known once every upload page has been consumed
+        _print_summary(counts['uploads'], len(playlist_slugs), counts['orphans'])
+        if not counts['orphans']:
+            console.info("No orphan tracks found - all uploads are in playlists!")
+        return
+    
+    result = find_orphan_tracks(args.username, cache_path=PLAYLIST_CACHE_PATH, cache_ttl=args.cache_ttl)
     if result is None:
         console.error("Error fetching data from Mixcloud")
         sys.exit(1)
     
     all_uploads, orphan_tracks, playlist_slugs = result
     
-    # Summary
-    console.summary_table(
-        "Summary",
-        [
-            ("Total uploads", str(len(all_uploads))),
-            ("In playlists", str(len(playlist_slugs))),
-            ("Orphans", str(len(orphan_tracks))),
-        ],
-    )
+    _print_summary(len(all_uploads), len(playlist_slugs), len(orphan_tracks))
     
     if not orphan_tracks:
         console.info("No orphan tracks found - all uploads are in playlists!")
         sys.exit(0)
     
-    # List orphans
-    orphan_rows = []
-    for i, track in enumerate(orphan_tracks, 1):
-        url = track.get('url') or f"https://www.mixcloud.com/{track.get('owner_username') or args.username}/{track['slug']}/"
-        orphan_rows.append((i, track['name'], url))
+    # List orphans (rows are built up front and rendered in a single table write)
+    orphan_rows = [
+        (i, track['name'], track['_url'])
+        for i, track in enumerate(orphan_tracks, 1)
+    ]
     console.table("Orphan Tracks", ["No", "Title", "URL"], orphan_rows)
-    
-    if not args.download:
-        console.info(f"Use --download to download these {len(orphan_tracks)} tracks")
-        sys.exit(0)
-    
-    # Download orphan tracks
-    console.rule("Downloading Orphan Tracks")
-    
-    # Import downloader functions
-    try:
-        from .mixcloud_downloader import (
-            fetch_track_info,
-            extract_codec_from_info,
-            download_track,
-        )
-        from .mixcloud_match_to_lrc import process_mp3, process_audio_with_url
-    except ImportError:
-        from mixcloud_downloader import (
-            fetch_track_info,
-            extract_codec_from_info,
-            download_track,
-        )
-        from mixcloud_match_to_lrc import process_mp3, process_audio_with_url
-    
-    downloaded_files = []
-    
-    for i, track in enumerate(orphan_tracks, 1):
-        url = track.get('url') or f"https://www.mixcloud.com/{track.get('owner_username') or args.username}/{track['slug']}/"
-        
-        # Fetch full track info
-        info = fetch_track_info(url)
-        title = info.get('title', track['name']) if info else track['name']
-        codec = extract_codec_from_info(info) if args.to_mp3 else 'unknown'
-        
-        console.print(f"[{i}/{len(orphan_tracks)}] {title}")
-        if args.to_mp3:
-            quality_desc = "best (opus source)" if codec == 'opus' else "medium (aac source)"
-            console.print(f"  Codec: {codec} → MP3 quality: {quality_desc}")
-        else:
-            console.print("  Audio: keeping original audio")
-        
-        # Download with "Orphans" as playlist name
-        mp3_path = download_track(url, args.output, args.archive, codec, "Orphans", info, to_mp3=args.to_mp3)
-        
-        if mp3_path and mp3_path.exists():
-            downloaded_files.append(mp3_path)
-            console.success(f"  ✓ Ready: {mp3_path}")
-            
-            # Process tracklist (embed/write LRC)
-            embed_lyrics = not args.no_embed
-            write_lrc = args.write_lrc
-            if embed_lyrics or write_lrc:
-                console.info("  Processing tracklist...")
-                try:
-                    process_audio_with_url(mp3_path, url, embed=embed_lyrics, write_file=write_lrc)
-                except Exception as e:
-                    console.error(f"  Tracklist error: {e}")
-    
-    # Final summary
-    console.summary_table(
-        "Download Complete",
-        [
-            ("Orphan tracks found", str(len(orphan_tracks))),
-            ("Tracks downloaded", str(len(downloaded_files))),
-            ("Archive file", str(args.archive)),
-        ],
-    )
+    console.info(f"Use --download to download these {len(orphan_tracks)} tracks")
 
 
 if __name__ == "__main__":
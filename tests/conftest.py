@@ -0,0 +1,37 @@
+"""
+Shared pytest fixtures.
+"""
+
+import threading
+from unittest.mock import Mock, MagicMock
+
+import pytest
+
+import mixcloud_common
+import mixcloud_downloader
+
+
+@pytest.fixture
+def mock_post(monkeypatch):
+    """Replace the shared GraphQL session's post() with a Mock."""
+    post = Mock()
+    monkeypatch.setattr(mixcloud_common._SESSION, "post", post)
+    return post
+
+
+
+@pytest.fixture
+def mock_ytdl(monkeypatch):
+    """
+    Replace yt_dlp.YoutubeDL in mixcloud_downloader with a context-manager mock.
+    
+    Returns the instance seen inside `with YoutubeDL(...) as ydl:`, which is
+    also what the per-thread extraction cache hands out (reset per test).
+    """
+    ydl = MagicMock()
+    ydl.__enter__.return_value = ydl
+    ydl.__exit__.return_value = False
+    monkeypatch.setattr(mixcloud_downloader.yt_dlp, "YoutubeDL", Mock(return_value=ydl))
+    monkeypatch.setattr(mixcloud_downloader, "_YDL_CACHE", threading.local())
+    monkeypatch.setattr(mixcloud_downloader, "_YDL_OPEN", [])
+    return ydl
@@ -2,8 +2,10 @@
 Unit tests for mixcloud_common.py shared utilities.
 """
 
+from types import MappingProxyType, SimpleNamespace
+
 import pytest
-from unittest.mock import patch, Mock
+from requests import RequestException
 
 from mixcloud_common import (
     extract_lookup,
@@ -12,140 +14,268 @@ from mixcloud_common import (
     fetch_user_playlists,
     fetch_user_uploads,
     fetch_playlist_items,
+    iter_user_upload_pages,
+    MixcloudAPIError,
+    TRACKLIST_QUERY,
+)
+
+
+def _ok(payload):
+    """HTTP 200 response stub whose json() returns `payload`."""
+    return SimpleNamespace(status_code=200, json=lambda: payload)
+
+
+def _err(status_code: int):
+    """Error response stub; the fetchers never read the body of these."""
+    return SimpleNamespace(status_code=status_code)
+
+
+def _freeze(value):
+    """
+    Recursively wrap dicts in read-only MappingProxyType views.
+    
+    Lists stay lists (with frozen contents) because fetch_tracklist returns
+    the sections list as-is and callers compare it against list literals.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_freeze(item) for item in value]
+    return value
+
+
+# Canned GraphQL payloads shared between tests. Mappings are read-only at every
+# level so a test cannot accidentally alter a payload another test relies on.
+_TWO_TRACKS = _freeze({
+    "data": {
+        "cloudcastLookup": {
+            "sections": [
+                {
+                    "__typename": "TrackSection",
+                    "startSeconds": 0,
+                    "artistName": "Artist 1",
+                    "songName": "Song 1"
+                },
+                {
+                    "__typename": "TrackSection",
+                    "startSeconds": 180.5,
+                    "artistName": "Artist 2",
+                    "songName": "Song 2"
+                }
+            ]
+        }
+    }
+})
+
+_TWO_CHAPTERS = _freeze({
+    "data": {
+        "cloudcastLookup": {
+            "sections": [
+                {
+                    "__typename": "ChapterSection",
+                    "startSeconds": 0,
+                    "chapter": "Introduction"
+                },
+                {
+                    "__typename": "ChapterSection",
+                    "startSeconds": 300,
+                    "chapter": "Main Content"
+                }
+            ]
+        }
+    }
+})
+
+_CLOUDCAST_NOT_FOUND = _freeze({
+    "data": {
+        "cloudcastLookup": None
+    }
+})
+
+_EMPTY_SECTIONS = _freeze({
+    "data": {
+        "cloudcastLookup": {
+            "sections": []
+        }
+    }
+})
+
+_USER_NOT_FOUND = _freeze({"data": {"userLookup": None}})
+
+_PLAYLISTS_PAGE_1 = _freeze({
+    "data": {
+        "userLookup": {
+            "playlists": {
+                "edges": [{"node": {"name": "Page 1", "slug": "page-1"}}],
+                "pageInfo": {"hasNextPage": True, "endCursor": "cursor123"}
+            }
+        }
+    }
+})
+
+_PLAYLISTS_PAGE_2 = _freeze({
+    "data": {
+        "userLookup": {
+            "playlists": {
+                "edges": [{"node": {"name": "Page 2", "slug": "page-2"}}],
+                "pageInfo": {"hasNextPage": False, "endCursor": None}
+            }
+        }
+    }
+})
+
+_EMPTY_PLAYLISTS = _freeze({
+    "data": {
+        "userLookup": {
+            "playlists": {
+                "edges": [],
+                "pageInfo": {"hasNextPage": False}
+            }
+        }
+    }
+})
+
+_UPLOADS_PAGE_1 = _freeze({
+    "data": {
+        "userLookup": {
+            "uploads": {
+                "edges": [{"node": {"name": "Mix One", "slug": "mix-one"}}],
+                "pageInfo": {"hasNextPage": True, "endCursor": "cursor1"}
+            }
+        }
+    }
+})
+
+_UPLOADS_PAGE_2 = _freeze({
+    "data": {
+        "userLookup": {
+            "uploads": {
+                "edges": [{"node": {"name": "Mix Two", "slug": "mix-two"}}],
+                "pageInfo": {"hasNextPage": False, "endCursor": None}
+            }
+        }
+    }
+})
+
+_EMPTY_UPLOADS = _freeze({
+    "data": {
+        "userLookup": {
+            "uploads": {
+                "edges": [],
+                "pageInfo": {"hasNextPage": False}
+            }
+        }
+    }
+})
+
+_ITEMS_PAGE_1 = _freeze({
+    "data": {
+        "playlistLookup": {
+            "items": {
+                "edges": [{"node": {"cloudcast": {"name": "Track One", "slug": "track-one"}}}],
+                "pageInfo": {"hasNextPage": True, "endCursor": "cursor1"}
+            }
+        }
+    }
+})
+
+_ITEMS_PAGE_2 = _freeze({
+    "data": {
+        "playlistLookup": {
+            "items": {
+                "edges": [{"node": {"cloudcast": {"name": "Track Two", "slug": "track-two"}}}],
+                "pageInfo": {"hasNextPage": False, "endCursor": None}
+            }
+        }
+    }
+})
+
+_EMPTY_PLAYLIST_ITEMS = _freeze({
+    "data": {
+        "playlistLookup": {
+            "items": {
+                "edges": [],
+                "pageInfo": {"hasNextPage": False}
+            }
+        }
+    }
+})
+
+# Shared transport failure; Mock re-raises the same instance on every call
+_REQ_ERR = RequestException("Connection timeout")
+
+
+# (url, (username, slug)) cases for extract_lookup
+EXTRACT_LOOKUP_CASES = (
+    # Standard Mixcloud URL extracts username and slug
+    pytest.param("https://www.mixcloud.com/DJ_Example/cool-mix-2024/", ("DJ_Example", "cool-mix-2024"), id="standard"),
+    pytest.param("https://www.mixcloud.com/user/mix-name", ("user", "mix-name"), id="no-trailing-slash"),
+    pytest.param("http://mixcloud.com/user/mix", ("user", "mix"), id="http"),
+    pytest.param("https://mixcloud.com/user/mix/", ("user", "mix"), id="no-www"),
+    # URL-encoded characters are decoded (%C3%A6 = æ, %20 = space)
+    pytest.param("https://www.mixcloud.com/Glastonauts_Live/fat-tez-%C3%A6lfgifu/", ("Glastonauts_Live", "fat-tez-ælfgifu"), id="encoded-special-chars"),
+    pytest.param("https://www.mixcloud.com/user/my%20cool%20mix/", ("user", "my cool mix"), id="encoded-spaces"),
+    # ';' is an ordinary slug character, not a urlparse-style params separator
+    pytest.param("https://mixcloud.com/u/s;x=1/", ("u", "s;x=1"), id="semicolon-in-slug"),
+    # Anything that isn't a Mixcloud user/slug URL returns (None, None)
+    pytest.param("https://soundcloud.com/user/mix", (None, None), id="not-mixcloud"),
+    pytest.param("https://mixcloud.com/user/", (None, None), id="missing-slug"),
+    pytest.param("", (None, None), id="empty"),
+    pytest.param("not a url at all", (None, None), id="garbage"),
+)
+
+# (seconds, LRC timestamp) cases for format_lrc_timestamp
+LRC_TIMESTAMP_CASES = (
+    pytest.param(0, "[00:00.00]", id="zero"),
+    # Fractional seconds are preserved
+    pytest.param(5.5, "[00:05.50]", id="fraction"),
+    pytest.param(5.05, "[00:05.05]", id="fraction-hundredths"),
+    pytest.param(60, "[01:00.00]", id="one-minute"),
+    pytest.param(65.5, "[01:05.50]", id="minutes-and-seconds"),
+    pytest.param(125.5, "[02:05.50]", id="minutes-and-seconds-2"),
+    # No hour field in LRC: 61 minutes and 1 second, 2 hours = 120 minutes
+    pytest.param(3661.0, "[61:01.00]", id="over-one-hour"),
+    pytest.param(7200, "[120:00.00]", id="large-value"),
+    # Very small fractions round correctly
+    pytest.param(0.01, "[00:00.01]", id="small-fraction"),
+    pytest.param(0.001, "[00:00.00]", id="rounds-to-zero"),
+    # Rounding up to a whole minute carries into the minute field
+    pytest.param(59.999, "[01:00.00]", id="rounds-into-next-minute"),
 )
 
 
 class TestExtractLookup:
     """Tests for extract_lookup URL parsing function."""
     
-    def test_valid_url_standard(self):
-        """Standard Mixcloud URL extracts username and slug."""
-        user, slug = extract_lookup("https://www.mixcloud.com/DJ_Example/cool-mix-2024/")
-        assert user == "DJ_Example"
-        assert slug == "cool-mix-2024"
-    
-    def test_valid_url_no_trailing_slash(self):
-        """URL without trailing slash works."""
-        user, slug = extract_lookup("https://www.mixcloud.com/user/mix-name")
-        assert user == "user"
-        assert slug == "mix-name"
+    @pytest.mark.parametrize("url,expected", EXTRACT_LOOKUP_CASES)
+    def test_extract_lookup(self, url, expected):
+        """URL is parsed into (username, slug) or (None, None)."""
+        assert extract_lookup(url) == expected
     
-    def test_valid_url_http(self):
-        """HTTP (non-HTTPS) URL works."""
-        user, slug = extract_lookup("http://mixcloud.com/user/mix")
-        assert user == "user"
-        assert slug == "mix"
-    
-    def test_valid_url_no_www(self):
-        """URL without www subdomain works."""
-        user, slug = extract_lookup("https://mixcloud.com/user/mix/")
-        assert user == "user"
-        assert slug == "mix"
-    
-    def test_encoded_url_special_chars(self):
-        """URL-encoded characters are decoded (æ, ø, etc.)."""
-        # %C3%A6 = æ (ae ligature)
-        user, slug = extract_lookup("https://www.mixcloud.com/Glastonauts_Live/fat-tez-%C3%A6lfgifu/")
-        assert user == "Glastonauts_Live"
-        assert slug == "fat-tez-ælfgifu"
-    
-    def test_encoded_url_spaces(self):
-        """URL-encoded spaces are decoded."""
-        user, slug = extract_lookup("https://www.mixcloud.com/user/my%20cool%20mix/")
-        assert user == "user"
-        assert slug == "my cool mix"
-    
-    def test_invalid_url_not_mixcloud(self):
-        """Non-Mixcloud URL returns (None, None)."""
-        user, slug = extract_lookup("https://soundcloud.com/user/mix")
-        assert user is None
-        assert slug is None
-    
-    def test_invalid_url_missing_slug(self):
-        """URL with only username returns (None, None)."""
-        user, slug = extract_lookup("https://mixcloud.com/user/")
-        assert user is None
-        assert slug is None
-    
-    def test_invalid_url_empty(self):
-        """Empty string returns (None, None)."""
-        user, slug = extract_lookup("")
-        assert user is None
-        assert slug is None
-    
-    def test_invalid_url_garbage(self):
-        """Random garbage returns (None, None)."""
-        user, slug = extract_lookup("not a url at all")
-        assert user is None
-        assert slug is None
+    def test_repeated_url_hits_cache(self):
+        """Parsing the same URL twice is served from the cache."""
+        url = "https://www.mixcloud.com/DJ/cool-mix/"
+        extract_lookup.cache_clear()
+        
+        assert extract_lookup(url) == extract_lookup(url)
+        assert extract_lookup.cache_info().hits == 1
 
 
 class TestFormatLrcTimestamp:
     """Tests for format_lrc_timestamp function."""
     
-    def test_zero_seconds(self):
-        """Zero seconds formats correctly."""
-        assert format_lrc_timestamp(0) == "[00:00.00]"
-    
-    def test_fractional_seconds(self):
-        """Fractional seconds are preserved."""
-        assert format_lrc_timestamp(5.5) == "[00:05.50]"
-        assert format_lrc_timestamp(5.05) == "[00:05.05]"
-    
-    def test_one_minute(self):
-        """60 seconds = 1 minute."""
-        assert format_lrc_timestamp(60) == "[01:00.00]"
-    
-    def test_minutes_and_seconds(self):
-        """Combined minutes and seconds."""
-        assert format_lrc_timestamp(65.5) == "[01:05.50]"
-        assert format_lrc_timestamp(125.5) == "[02:05.50]"
-    
-    def test_over_one_hour(self):
-        """Times over one hour (no hour field in LRC)."""
-        # 61 minutes and 1 second
-        assert format_lrc_timestamp(3661.0) == "[61:01.00]"
-    
-    def test_large_value(self):
-        """Very large values (2+ hours)."""
-        # 2 hours = 120 minutes
-        assert format_lrc_timestamp(7200) == "[120:00.00]"
-    
-    def test_small_fraction(self):
-        """Very small fractions round correctly."""
-        assert format_lrc_timestamp(0.01) == "[00:00.01]"
-        assert format_lrc_timestamp(0.001) == "[00:00.00]"  # rounds to 0
+    @pytest.mark.parametrize("seconds,expected", LRC_TIMESTAMP_CASES)
+    def test_format_lrc_timestamp(self, seconds, expected):
+        """Seconds are formatted as an [mm:ss.xx] LRC timestamp."""
+        assert format_lrc_timestamp(seconds) == expected
 
 
 class TestFetchTracklist:
     """Tests for fetch_tracklist API function."""
     
-    @patch('mixcloud_common.requests.post')
     def test_success_with_sections(self, mock_post):
         """Successful API response returns sections list."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": {
-                "cloudcastLookup": {
-                    "sections": [
-                        {
-                            "__typename": "TrackSection",
-                            "startSeconds": 0,
-                            "artistName": "Artist 1",
-                            "songName": "Song 1"
-                        },
-                        {
-                            "__typename": "TrackSection",
-                            "startSeconds": 180.5,
-                            "artistName": "Artist 2",
-                            "songName": "Song 2"
-                        }
-                    ]
-                }
-            }
-        }
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok(_TWO_TRACKS)
         
         sections = fetch_tracklist("user", "mix-slug")
         
@@ -154,30 +284,9 @@ class TestFetchTracklist:
         assert sections[0]["artistName"] == "Artist 1"
         assert sections[1]["startSeconds"] == 180.5
     
-    @patch('mixcloud_common.requests.post')
     def test_success_with_chapters(self, mock_post):
         """API response with ChapterSection type."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": {
-                "cloudcastLookup": {
-                    "sections": [
-                        {
-                            "__typename": "ChapterSection",
-                            "startSeconds": 0,
-                            "chapter": "Introduction"
-                        },
-                        {
-                            "__typename": "ChapterSection",
-                            "startSeconds": 300,
-                            "chapter": "Main Content"
-                        }
-                    ]
-                }
-            }
-        }
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok(_TWO_CHAPTERS)
         
         sections = fetch_tracklist("user", "podcast-slug")
         
@@ -186,68 +295,41 @@ class TestFetchTracklist:
         assert sections[0]["__typename"] == "ChapterSection"
         assert sections[0]["chapter"] == "Introduction"
     
-    @patch('mixcloud_common.requests.post')
     def test_cloudcast_not_found(self, mock_post):
         """API returns null cloudcastLookup for non-existent content."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": {
-                "cloudcastLookup": None
-            }
-        }
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok(_CLOUDCAST_NOT_FOUND)
         
         sections = fetch_tracklist("user", "nonexistent-mix")
         
         assert sections is None
     
-    @patch('mixcloud_common.requests.post')
     def test_http_error(self, mock_post):
         """Non-200 HTTP status returns None."""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_post.return_value = mock_response
+        mock_post.return_value = _err(500)
         
         sections = fetch_tracklist("user", "mix")
         
         assert sections is None
     
-    @patch('mixcloud_common.requests.post')
     def test_network_error(self, mock_post):
         """Network exception returns None."""
-        import requests as req
-        mock_post.side_effect = req.RequestException("Connection timeout")
+        mock_post.side_effect = _REQ_ERR
         
         sections = fetch_tracklist("user", "mix")
         
         assert sections is None
     
-    @patch('mixcloud_common.requests.post')
     def test_empty_sections(self, mock_post):
         """Cloudcast with no sections returns empty list."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": {
-                "cloudcastLookup": {
-                    "sections": []
-                }
-            }
-        }
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok(_EMPTY_SECTIONS)
         
         sections = fetch_tracklist("user", "mix")
         
         assert sections == []
     
-    @patch('mixcloud_common.requests.post')
     def test_api_called_with_correct_params(self, mock_post):
         """Verify correct GraphQL query and variables sent."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": {"cloudcastLookup": {"sections": []}}}
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok(_EMPTY_SECTIONS)
         
         fetch_tracklist("testuser", "testslug")
         
@@ -256,18 +338,15 @@ class TestFetchTracklist:
         assert call_kwargs['json']['variables'] == {
             "lookup": {"username": "testuser", "slug": "testslug"}
         }
-        assert "cloudcastLookup" in call_kwargs['json']['query']
+        assert call_kwargs['json']['query'] is TRACKLIST_QUERY
 
 
 class TestFetchUserPlaylists:
     """Tests for fetch_user_playlists function."""
     
-    @patch('mixcloud_common.requests.post')
     def test_returns_playlists(self, mock_post):
         """Returns list of playlist dicts with name and slug."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_post.return_value = _ok({
             "data": {
                 "userLookup": {
                     "playlists": {
@@ -279,8 +358,7 @@ class TestFetchUserPlaylists:
                     }
                 }
             }
-        }
-        mock_post.return_value = mock_response
+        })
         
         playlists = fetch_user_playlists("testuser")
         
@@ -288,35 +366,12 @@ class TestFetchUserPlaylists:
         assert playlists[0] == {"name": "Playlist One", "slug": "playlist-one"}
         assert playlists[1] == {"name": "Playlist Two", "slug": "playlist-two"}
     
-    @patch('mixcloud_common.requests.post')
     def test_handles_pagination(self, mock_post):
         """Fetches multiple pages of playlists."""
         # First page response
-        page1 = Mock()
-        page1.status_code = 200
-        page1.json.return_value = {
-            "data": {
-                "userLookup": {
-                    "playlists": {
-                        "edges": [{"node": {"name": "Page 1", "slug": "page-1"}}],
-                        "pageInfo": {"hasNextPage": True, "endCursor": "cursor123"}
-                    }
-                }
-            }
-        }
+        page1 = _ok(_PLAYLISTS_PAGE_1)
         # Second page response
-        page2 = Mock()
-        page2.status_code = 200
-        page2.json.return_value = {
-            "data": {
-                "userLookup": {
-                    "playlists": {
-                        "edges": [{"node": {"name": "Page 2", "slug": "page-2"}}],
-                        "pageInfo": {"hasNextPage": False, "endCursor": None}
-                    }
-                }
-            }
-        }
+        page2 = _ok(_PLAYLISTS_PAGE_2)
         mock_post.side_effect = [page1, page2]
         
         playlists = fetch_user_playlists("testuser")
@@ -326,66 +381,41 @@ class TestFetchUserPlaylists:
         assert playlists[1]["name"] == "Page 2"
         assert mock_post.call_count == 2
     
-    @patch('mixcloud_common.requests.post')
     def test_user_not_found(self, mock_post):
         """Returns None when user doesn't exist."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": {"userLookup": None}}
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok(_USER_NOT_FOUND)
         
         result = fetch_user_playlists("nonexistent")
         
         assert result is None
     
-    @patch('mixcloud_common.requests.post')
     def test_http_error(self, mock_post):
         """Returns None on HTTP error."""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_post.return_value = mock_response
+        mock_post.return_value = _err(500)
         
         result = fetch_user_playlists("testuser")
         
         assert result is None
     
-    @patch('mixcloud_common.requests.post')
     def test_network_error(self, mock_post):
         """Returns None on network error."""
-        import requests as req
-        mock_post.side_effect = req.RequestException("Timeout")
+        mock_post.side_effect = _REQ_ERR
         
         result = fetch_user_playlists("testuser")
         
         assert result is None
     
-    @patch('mixcloud_common.requests.post')
     def test_empty_playlists(self, mock_post):
         """Returns empty list when user has no playlists."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": {
-                "userLookup": {
-                    "playlists": {
-                        "edges": [],
-                        "pageInfo": {"hasNextPage": False}
-                    }
-                }
-            }
-        }
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok(_EMPTY_PLAYLISTS)
         
         playlists = fetch_user_playlists("testuser")
         
         assert playlists == []
     
-    @patch('mixcloud_common.requests.post')
     def test_handles_missing_fields(self, mock_post):
         """Handles missing name/slug with defaults."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_post.return_value = _ok({
             "data": {
                 "userLookup": {
                     "playlists": {
@@ -394,8 +424,7 @@ class TestFetchUserPlaylists:
                     }
                 }
             }
-        }
-        mock_post.return_value = mock_response
+        })
         
         playlists = fetch_user_playlists("testuser")
         
@@ -405,12 +434,9 @@ class TestFetchUserPlaylists:
 class TestFetchUserUploads:
     """Tests for fetch_user_uploads GraphQL API function."""
     
-    @patch('mixcloud_common.requests.post')
     def test_success_single_page(self, mock_post):
         """Successfully fetch uploads in a single page."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_post.return_value = _ok({
             "data": {
                 "userLookup": {
                     "uploads": {
@@ -422,8 +448,7 @@ class TestFetchUserUploads:
                     }
                 }
             }
-        }
-        mock_post.return_value = mock_response
+        })
         
         uploads = fetch_user_uploads("testuser")
         
@@ -432,33 +457,10 @@ class TestFetchUserUploads:
         assert uploads[0] == {"name": "Mix One", "slug": "mix-one", "url": "https://www.mixcloud.com/user/mix-one/", "owner_username": None}
         assert uploads[1] == {"name": "Mix Two", "slug": "mix-two", "url": "https://www.mixcloud.com/user/mix-two/", "owner_username": None}
 
-    @patch('mixcloud_common.requests.post')
     def test_success_with_pagination(self, mock_post):
         """Successfully fetch uploads across multiple pages."""
-        response1 = Mock()
-        response1.status_code = 200
-        response1.json.return_value = {
-            "data": {
-                "userLookup": {
-                    "uploads": {
-                        "edges": [{"node": {"name": "Mix One", "slug": "mix-one"}}],
-                        "pageInfo": {"hasNextPage": True, "endCursor": "cursor1"}
-                    }
-                }
-            }
-        }
-        response2 = Mock()
-        response2.status_code = 200
-        response2.json.return_value = {
-            "data": {
-                "userLookup": {
-                    "uploads": {
-                        "edges": [{"node": {"name": "Mix Two", "slug": "mix-two"}}],
-                        "pageInfo": {"hasNextPage": False, "endCursor": None}
-                    }
-                }
-            }
-        }
+        response1 = _ok(_UPLOADS_PAGE_1)
+        response2 = _ok(_UPLOADS_PAGE_2)
         mock_post.side_effect = [response1, response2]
         
         uploads = fetch_user_uploads("testuser")
@@ -466,70 +468,70 @@ class TestFetchUserUploads:
         assert len(uploads) == 2
         assert mock_post.call_count == 2
 
-    @patch('mixcloud_common.requests.post')
     def test_user_not_found(self, mock_post):
         """Returns None when user doesn't exist."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": {"userLookup": None}}
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok(_USER_NOT_FOUND)
         
         uploads = fetch_user_uploads("nonexistent")
         
         assert uploads is None
 
-    @patch('mixcloud_common.requests.post')
     def test_http_error(self, mock_post):
         """Returns None on HTTP error."""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_post.return_value = mock_response
+        mock_post.return_value = _err(500)
         
         uploads = fetch_user_uploads("testuser")
         
         assert uploads is None
 
-    @patch('mixcloud_common.requests.post')
     def test_network_error(self, mock_post):
         """Returns None on network exception."""
-        import requests as req
-        mock_post.side_effect = req.RequestException("Connection timeout")
+        mock_post.side_effect = _REQ_ERR
         
         uploads = fetch_user_uploads("testuser")
         
         assert uploads is None
 
-    @patch('mixcloud_common.requests.post')
     def test_empty_uploads(self, mock_post):
         """Returns empty list when user has no uploads."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": {
-                "userLookup": {
-                    "uploads": {
-                        "edges": [],
-                        "pageInfo": {"hasNextPage": False}
-                    }
-                }
-            }
-        }
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok(_EMPTY_UPLOADS)
         
         uploads = fetch_user_uploads("testuser")
         
         assert uploads == []
 
 
+class TestIterUserUploadPages:
+    """Tests for iter_user_upload_pages streaming function."""
+
+    def test_yields_each_page_before_fetching_next(self, mock_post):
+        """A page is yielded before the following page is requested."""
+        response1 = _ok(_UPLOADS_PAGE_1)
+        response2 = _ok(_UPLOADS_PAGE_2)
+        mock_post.side_effect = [response1, response2]
+        
+        pages = iter_user_upload_pages("testuser")
+        first = next(pages)
+        
+        assert [u["slug"] for u in first] == ["mix-one"]
+        assert mock_post.call_count == 1
+        assert [u["slug"] for u in next(pages)] == ["mix-two"]
+        assert next(pages, None) is None
+
+    def test_raises_on_http_error(self, mock_post):
+        """Raises MixcloudAPIError on a non-200 response."""
+        mock_post.return_value = _err(500)
+        
+        with pytest.raises(MixcloudAPIError):
+            list(iter_user_upload_pages("testuser"))
+
+
 class TestFetchPlaylistItems:
     """Tests for fetch_playlist_items GraphQL API function."""
     
-    @patch('mixcloud_common.requests.post')
     def test_success_single_page(self, mock_post):
         """Successfully fetch playlist items in a single page."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_post.return_value = _ok({
             "data": {
                 "playlistLookup": {
                     "items": {
@@ -541,8 +543,7 @@ class TestFetchPlaylistItems:
                     }
                 }
             }
-        }
-        mock_post.return_value = mock_response
+        })
         
         items = fetch_playlist_items("testuser", "my-playlist")
         
@@ -551,33 +552,10 @@ class TestFetchPlaylistItems:
         assert items[0] == {"name": "Track One", "slug": "track-one"}
         assert items[1] == {"name": "Track Two", "slug": "track-two"}
 
-    @patch('mixcloud_common.requests.post')
     def test_success_with_pagination(self, mock_post):
         """Successfully fetch playlist items across multiple pages."""
-        response1 = Mock()
-        response1.status_code = 200
-        response1.json.return_value = {
-            "data": {
-                "playlistLookup": {
-                    "items": {
-                        "edges": [{"node": {"cloudcast": {"name": "Track One", "slug": "track-one"}}}],
-                        "pageInfo": {"hasNextPage": True, "endCursor": "cursor1"}
-                    }
-                }
-            }
-        }
-        response2 = Mock()
-        response2.status_code = 200
-        response2.json.return_value = {
-            "data": {
-                "playlistLookup": {
-                    "items": {
-                        "edges": [{"node": {"cloudcast": {"name": "Track Two", "slug": "track-two"}}}],
-                        "pageInfo": {"hasNextPage": False, "endCursor": None}
-                    }
-                }
-            }
-        }
+        response1 = _ok(_ITEMS_PAGE_1)
+        response2 = _ok(_ITEMS_PAGE_2)
         mock_post.side_effect = [response1, response2]
         
         items = fetch_playlist_items("testuser", "my-playlist")
@@ -585,66 +563,41 @@ class TestFetchPlaylistItems:
         assert len(items) == 2
         assert mock_post.call_count == 2
 
-    @patch('mixcloud_common.requests.post')
     def test_playlist_not_found(self, mock_post):
         """Returns None when playlist doesn't exist."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": {"playlistLookup": None}}
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok({"data": {"playlistLookup": None}})
         
         items = fetch_playlist_items("testuser", "nonexistent")
         
         assert items is None
 
-    @patch('mixcloud_common.requests.post')
     def test_http_error(self, mock_post):
         """Returns None on HTTP error."""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_post.return_value = mock_response
+        mock_post.return_value = _err(500)
         
         items = fetch_playlist_items("testuser", "my-playlist")
         
         assert items is None
 
-    @patch('mixcloud_common.requests.post')
     def test_network_error(self, mock_post):
         """Returns None on network exception."""
-        import requests as req
-        mock_post.side_effect = req.RequestException("Connection timeout")
+        mock_post.side_effect = _REQ_ERR
         
         items = fetch_playlist_items("testuser", "my-playlist")
         
         assert items is None
 
-    @patch('mixcloud_common.requests.post')
     def test_empty_playlist(self, mock_post):
         """Returns empty list when playlist has no items."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": {
-                "playlistLookup": {
-                    "items": {
-                        "edges": [],
-                        "pageInfo": {"hasNextPage": False}
-                    }
-                }
-            }
-        }
-        mock_post.return_value = mock_response
+        mock_post.return_value = _ok(_EMPTY_PLAYLIST_ITEMS)
         
         items = fetch_playlist_items("testuser", "my-playlist")
         
         assert items == []
 
-    @patch('mixcloud_common.requests.post')
     def test_handles_null_cloudcast(self, mock_post):
         """Skips items with null cloudcast field."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_post.return_value = _ok({
             "data": {
                 "playlistLookup": {
                     "items": {
@@ -657,8 +610,7 @@ class TestFetchPlaylistItems:
                     }
                 }
             }
-        }
-        mock_post.return_value = mock_response
+        })
         
         items = fetch_playlist_items("testuser", "my-playlist")
         
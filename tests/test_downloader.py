@@ -2,10 +2,16 @@
 Unit tests for mixcloud_downloader.py automated downloader.
 """
 
+import subprocess
+import sys
+import threading
+from types import MappingProxyType
+
 import pytest
 from pathlib import Path
-from unittest.mock import patch, Mock, MagicMock
+from unittest.mock import patch
 
+import mixcloud_downloader
 from mixcloud_downloader import (
     get_user_playlists,
     get_user_uploads,
@@ -13,70 +19,83 @@ from mixcloud_downloader import (
     detect_audio_codec,
     extract_codec_from_info,
     fetch_track_info,
+    download_track,
+    load_download_archive,
+    archive_id_for_url,
     _extract_entries,
 )
 
 
+# Shared extraction failure; Mock re-raises the same instance on every call
+_NET_ERR = Exception("Network error")
+
+# (track info, expected codec) cases for extract_codec_from_info / detect_audio_codec
+CODEC_CASES = (
+    pytest.param({'formats': [{'acodec': 'opus', 'ext': 'webm'}]}, 'opus', id="opus"),
+    pytest.param({'formats': [{'acodec': 'aac', 'ext': 'm4a'}]}, 'aac', id="aac"),
+    pytest.param({'formats': [{'acodec': 'mp4a.40.2', 'ext': 'm4a'}]}, 'aac', id="mp4a-as-aac"),
+    pytest.param({'formats': [{'acodec': 'OPUS'}]}, 'opus', id="case-insensitive"),
+    # Video-only ('none') and unrecognised audio codecs are skipped
+    pytest.param({'formats': [{'acodec': 'none', 'vcodec': 'h264'}, {'acodec': 'opus'}]}, 'opus', id="skips-video-only"),
+    pytest.param({'formats': [{'acodec': 'flac'}, {'acodec': 'mp4a.40.2'}]}, 'aac', id="skips-unrecognised"),
+    pytest.param({'formats': [{'acodec': 'none'}]}, 'unknown', id="no-audio-codec"),
+    # Top-level acodec is the fallback when formats are missing or empty
+    pytest.param({'formats': [], 'acodec': 'opus'}, 'opus', id="top-level-fallback"),
+    pytest.param({'formats': None, 'acodec': 'aac'}, 'aac', id="none-formats"),
+    pytest.param({'formats': [], 'acodec': None}, 'unknown', id="none-top-level-acodec"),
+)
+
+# Flat-extraction payloads; read-only so a test can't mutate another's input
+_MIX_1 = MappingProxyType({'url': 'https://mixcloud.com/user/mix1/', 'title': 'Mix 1'})
+_MIX_2 = MappingProxyType({'url': 'https://mixcloud.com/user/mix2/', 'title': 'Mix 2'})
+_MIX_NO_URL = MappingProxyType({'title': 'Mix No URL'})
+
+_PLAYLIST_INFO = MappingProxyType({'entries': (_MIX_1, _MIX_2)})
+# yt-dlp reports unavailable entries as None
+_PLAYLIST_INFO_WITH_GAPS = MappingProxyType({'entries': (_MIX_1, None, _MIX_2, None)})
+
+
 class TestExtractEntries:
     """Tests for _extract_entries helper function."""
     
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_extracts_entries(self, mock_ytdl_class):
+    def test_extracts_entries(self, mock_ytdl):
         """Returns list of entries from yt-dlp extraction."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {
-            'entries': [
-                {'url': 'https://mixcloud.com/user/mix1/', 'title': 'Mix 1'},
-                {'url': 'https://mixcloud.com/user/mix2/', 'title': 'Mix 2'},
-            ]
-        }
-        mock_ytdl_class.return_value = mock_ydl
+        mock_ytdl.extract_info.return_value = _PLAYLIST_INFO
         
         entries = _extract_entries("https://mixcloud.com/user/playlists/")
         
         assert len(entries) == 2
         assert entries[0]['title'] == 'Mix 1'
     
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_filters_none_entries(self, mock_ytdl_class):
+    def test_filters_none_entries(self, mock_ytdl):
         """None entries in the list are filtered out."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {
-            'entries': [
-                {'url': 'https://mixcloud.com/user/mix1/', 'title': 'Mix 1'},
-                None,
-                {'url': 'https://mixcloud.com/user/mix2/', 'title': 'Mix 2'},
-                None,
-            ]
-        }
-        mock_ytdl_class.return_value = mock_ydl
+        mock_ytdl.extract_info.return_value = _PLAYLIST_INFO_WITH_GAPS
         
         entries = _extract_entries("https://mixcloud.com/user/playlists/")
         
         assert len(entries) == 2
     
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_returns_empty_on_no_entries(self, mock_ytdl_class):
+    def test_returns_empty_on_no_entries(self, mock_ytdl):
         """Returns empty list when no entries key."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {'id': 'something'}
-        mock_ytdl_class.return_value = mock_ydl
+        mock_ytdl.extract_info.return_value = {'id': 'something'}
+        
+        entries = _extract_entries("https://mixcloud.com/user/mix/")
+        
+        assert entries == []
+    
+    def test_returns_empty_on_null_entries(self, mock_ytdl):
+        """Returns empty list when entries is present but null."""
+        mock_ytdl.extract_info.return_value = {'entries': None}
         
         entries = _extract_entries("https://mixcloud.com/user/mix/")
         
         assert entries == []
 
 
+@patch.object(mixcloud_downloader, 'fetch_user_playlists')
 class TestGetUserPlaylists:
     """Tests for get_user_playlists function."""
     
-    @patch('mixcloud_downloader.fetch_user_playlists')
     def test_returns_playlists(self, mock_fetch):
         """Returns formatted playlist dicts with url and title."""
         mock_fetch.return_value = [
@@ -91,7 +110,6 @@ class TestGetUserPlaylists:
         assert playlists[1] == {'url': 'https://www.mixcloud.com/testuser/playlists/playlist2/', 'title': 'Another Playlist'}
         mock_fetch.assert_called_once_with("testuser")
     
-    @patch('mixcloud_downloader.fetch_user_playlists')
     def test_returns_empty_on_none(self, mock_fetch):
         """Returns empty list when API returns None."""
         mock_fetch.return_value = None
@@ -99,12 +117,20 @@ class TestGetUserPlaylists:
         playlists = get_user_playlists("testuser")
         
         assert playlists == []
+    
+    def test_returns_empty_list(self, mock_fetch):
+        """Returns empty list when user has no playlists."""
+        mock_fetch.return_value = []
+        
+        playlists = get_user_playlists("testuser")
+        
+        assert playlists == []
 
 
 class TestGetUserUploads:
     """Tests for get_user_uploads function."""
     
-    @patch('mixcloud_downloader.fetch_user_uploads')
+    @patch.object(mixcloud_downloader, 'fetch_user_uploads')
     def test_returns_uploads(self, mock_fetch):
         """Returns formatted upload dicts with url and title."""
         mock_fetch.return_value = [
@@ -119,7 +145,7 @@ class TestGetUserUploads:
         assert uploads[1] == {'url': 'https://www.mixcloud.com/owner2/mix-two/', 'title': 'Mix Two'}
         mock_fetch.assert_called_once_with("testuser")
     
-    @patch('mixcloud_downloader.fetch_user_uploads')
+    @patch.object(mixcloud_downloader, 'fetch_user_uploads')
     def test_returns_empty_on_none(self, mock_fetch):
         """Returns empty list when API returns None."""
         mock_fetch.return_value = None
@@ -128,7 +154,7 @@ class TestGetUserUploads:
         
         assert uploads == []
     
-    @patch('mixcloud_downloader.fetch_user_uploads')
+    @patch.object(mixcloud_downloader, 'fetch_user_uploads')
     def test_returns_empty_list(self, mock_fetch):
         """Returns empty list when user has no uploads."""
         mock_fetch.return_value = []
@@ -136,38 +162,23 @@ class TestGetUserUploads:
         uploads = get_user_uploads("testuser")
         
         assert uploads == []
-    
-    @patch('mixcloud_downloader.fetch_user_playlists')
-    def test_returns_empty_list(self, mock_fetch):
-        """Returns empty list when user has no playlists."""
-        mock_fetch.return_value = []
-        
-        playlists = get_user_playlists("testuser")
-        
-        assert playlists == []
 
 
+@patch.object(mixcloud_downloader, '_extract_entries')
 class TestGetPlaylistEntries:
     """Tests for get_playlist_entries function."""
     
-    @patch('mixcloud_downloader._extract_entries')
     def test_returns_entries_with_urls(self, mock_extract):
         """Returns only entries that have URLs."""
-        mock_extract.return_value = [
-            {'url': 'https://mixcloud.com/user/mix1/', 'title': 'Mix 1'},
-            {'title': 'Mix No URL'},  # Missing URL
-            {'url': 'https://mixcloud.com/user/mix2/', 'title': 'Mix 2'},
-        ]
+        mock_extract.return_value = [_MIX_1, _MIX_NO_URL, _MIX_2]
         
         entries = get_playlist_entries("https://mixcloud.com/user/playlist/")
         
-        assert len(entries) == 2
-        assert all(e.get('url') for e in entries)
+        assert entries == [_MIX_1, _MIX_2]
     
-    @patch('mixcloud_downloader._extract_entries')
     def test_returns_empty_on_error(self, mock_extract):
         """Returns empty list on extraction error."""
-        mock_extract.side_effect = Exception("Network error")
+        mock_extract.side_effect = _NET_ERR
         
         entries = get_playlist_entries("https://mixcloud.com/user/playlist/")
         
@@ -177,136 +188,20 @@ class TestGetPlaylistEntries:
 class TestDetectAudioCodec:
     """Tests for detect_audio_codec function."""
     
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_detects_opus(self, mock_ytdl_class):
-        """Detects opus codec from formats."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {
-            'formats': [
-                {'format_id': 'http', 'acodec': 'opus', 'ext': 'webm'},
-            ]
-        }
-        mock_ytdl_class.return_value = mock_ydl
-        
-        codec = detect_audio_codec("https://mixcloud.com/user/mix/")
-        
-        assert codec == 'opus'
-    
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_detects_aac(self, mock_ytdl_class):
-        """Detects aac codec from formats."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {
-            'formats': [
-                {'format_id': 'http', 'acodec': 'aac', 'ext': 'm4a'},
-            ]
-        }
-        mock_ytdl_class.return_value = mock_ydl
-        
-        codec = detect_audio_codec("https://mixcloud.com/user/mix/")
-        
-        assert codec == 'aac'
-    
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_detects_mp4a_as_aac(self, mock_ytdl_class):
-        """Detects mp4a codec as aac."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {
-            'formats': [
-                {'format_id': 'http', 'acodec': 'mp4a.40.2', 'ext': 'm4a'},
-            ]
-        }
-        mock_ytdl_class.return_value = mock_ydl
-        
-        codec = detect_audio_codec("https://mixcloud.com/user/mix/")
-        
-        assert codec == 'aac'
-    
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_uses_top_level_acodec_fallback(self, mock_ytdl_class):
-        """Falls back to top-level acodec when formats empty."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {
-            'formats': [],
-            'acodec': 'opus'
-        }
-        mock_ytdl_class.return_value = mock_ydl
-        
-        codec = detect_audio_codec("https://mixcloud.com/user/mix/")
+    @pytest.mark.parametrize("info,expected", CODEC_CASES)
+    def test_detect_audio_codec(self, mock_ytdl, info, expected):
+        """Codec is detected from the extracted track info."""
+        mock_ytdl.extract_info.return_value = info
         
-        assert codec == 'opus'
-    
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_returns_unknown_on_no_codec(self, mock_ytdl_class):
-        """Returns 'unknown' when no codec can be determined."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {
-            'formats': [
-                {'format_id': 'http', 'acodec': 'none'},
-            ]
-        }
-        mock_ytdl_class.return_value = mock_ydl
-        
-        codec = detect_audio_codec("https://mixcloud.com/user/mix/")
-        
-        assert codec == 'unknown'
+        assert detect_audio_codec("https://mixcloud.com/user/mix/") == expected
     
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_returns_unknown_on_error(self, mock_ytdl_class):
+    def test_returns_unknown_on_error(self, mock_ytdl):
         """Returns 'unknown' when extraction fails."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.side_effect = Exception("Network error")
-        mock_ytdl_class.return_value = mock_ydl
+        mock_ytdl.extract_info.side_effect = _NET_ERR
         
         codec = detect_audio_codec("https://mixcloud.com/user/mix/")
         
         assert codec == 'unknown'
-    
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_skips_video_only_formats(self, mock_ytdl_class):
-        """Skips formats where acodec is 'none' (video only)."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {
-            'formats': [
-                {'format_id': 'video', 'acodec': 'none', 'vcodec': 'h264'},
-                {'format_id': 'audio', 'acodec': 'opus', 'vcodec': 'none'},
-            ]
-        }
-        mock_ytdl_class.return_value = mock_ydl
-        
-        codec = detect_audio_codec("https://mixcloud.com/user/mix/")
-        
-        assert codec == 'opus'
-    
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_handles_none_formats(self, mock_ytdl_class):
-        """Handles None formats list gracefully."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {
-            'formats': None,
-            'acodec': 'aac'
-        }
-        mock_ytdl_class.return_value = mock_ydl
-        
-        codec = detect_audio_codec("https://mixcloud.com/user/mix/")
-        
-        assert codec == 'aac'
 
 
 class TestExtractCodecFromInfo:
@@ -320,72 +215,164 @@ class TestExtractCodecFromInfo:
         """Returns 'unknown' for empty info dict."""
         assert extract_codec_from_info({}) == 'unknown'
     
-    def test_detects_opus_from_formats(self):
-        """Detects opus codec from formats list."""
-        info = {'formats': [{'acodec': 'opus', 'ext': 'webm'}]}
-        assert extract_codec_from_info(info) == 'opus'
-    
-    def test_detects_aac_from_formats(self):
-        """Detects aac codec from formats list."""
-        info = {'formats': [{'acodec': 'aac', 'ext': 'm4a'}]}
-        assert extract_codec_from_info(info) == 'aac'
-    
-    def test_detects_mp4a_as_aac(self):
-        """Detects mp4a.40.2 as aac."""
-        info = {'formats': [{'acodec': 'mp4a.40.2'}]}
-        assert extract_codec_from_info(info) == 'aac'
-    
-    def test_skips_none_acodec(self):
-        """Skips formats with acodec='none' (video only)."""
-        info = {
-            'formats': [
-                {'acodec': 'none', 'vcodec': 'h264'},
-                {'acodec': 'opus'},
-            ]
-        }
-        assert extract_codec_from_info(info) == 'opus'
-    
-    def test_falls_back_to_top_level_acodec(self):
-        """Falls back to top-level acodec when formats empty."""
-        info = {'formats': [], 'acodec': 'opus'}
-        assert extract_codec_from_info(info) == 'opus'
-    
-    def test_handles_none_formats_list(self):
-        """Handles None formats list gracefully."""
-        info = {'formats': None, 'acodec': 'aac'}
-        assert extract_codec_from_info(info) == 'aac'
-    
-    def test_case_insensitive_codec_detection(self):
-        """Codec detection is case-insensitive."""
-        info = {'formats': [{'acodec': 'OPUS'}]}
-        assert extract_codec_from_info(info) == 'opus'
+    @pytest.mark.parametrize("info,expected", CODEC_CASES)
+    def test_extract_codec_from_info(self, info, expected):
+        """Codec is mapped from the formats list or top-level acodec."""
+        assert extract_codec_from_info(info) == expected
 
 
 class TestFetchTrackInfo:
     """Tests for fetch_track_info function."""
     
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_returns_info_dict(self, mock_ytdl_class):
+    def test_returns_info_dict(self, mock_ytdl):
         """Returns info dict on success."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.return_value = {'title': 'Test Mix', 'uploader': 'DJ'}
-        mock_ytdl_class.return_value = mock_ydl
+        mock_ytdl.extract_info.return_value = {'title': 'Test Mix', 'uploader': 'DJ'}
         
         info = fetch_track_info("https://mixcloud.com/user/mix/")
         
         assert info == {'title': 'Test Mix', 'uploader': 'DJ'}
     
-    @patch('mixcloud_downloader.yt_dlp.YoutubeDL')
-    def test_returns_none_on_error(self, mock_ytdl_class):
+    def test_returns_none_on_error(self, mock_ytdl):
         """Returns None on extraction error."""
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = Mock(return_value=mock_ydl)
-        mock_ydl.__exit__ = Mock(return_value=False)
-        mock_ydl.extract_info.side_effect = Exception("Track not found")
-        mock_ytdl_class.return_value = mock_ydl
+        mock_ytdl.extract_info.side_effect = _NET_ERR
         
         info = fetch_track_info("https://mixcloud.com/user/missing/")
         
-        assert info is None
\ No newline at end of file
+        assert info is None
+    
+    def test_reuses_youtubedl_within_thread(self, mock_ytdl):
+        """Repeated lookups on one thread construct YoutubeDL only once."""
+        fetch_track_info("https://mixcloud.com/user/mix-1/")
+        fetch_track_info("https://mixcloud.com/user/mix-2/")
+        
+        assert mixcloud_downloader.yt_dlp.YoutubeDL.call_count == 1
+        assert mock_ytdl.extract_info.call_count == 2
+    
+    def test_separate_youtubedl_per_thread(self, mock_ytdl):
+        """Each thread gets its own YoutubeDL, since instances aren't thread-safe."""
+        fetch_track_info("https://mixcloud.com/user/mix-1/")
+        worker = threading.Thread(target=fetch_track_info, args=("https://mixcloud.com/user/mix-2/",))
+        worker.start()
+        worker.join()
+        
+        assert mixcloud_downloader.yt_dlp.YoutubeDL.call_count == 2
+    
+    def test_close_releases_every_thread_instance(self, mock_ytdl):
+        """close_extraction_ydls closes instances from all threads and drops the cache."""
+        worker = threading.Thread(target=fetch_track_info, args=("https://mixcloud.com/user/mix-1/",))
+        worker.start()
+        worker.join()
+        fetch_track_info("https://mixcloud.com/user/mix-2/")
+        
+        mixcloud_downloader.close_extraction_ydls()
+        fetch_track_info("https://mixcloud.com/user/mix-3/")
+        
+        assert mock_ytdl.close.call_count == 2
+        assert mixcloud_downloader.yt_dlp.YoutubeDL.call_count == 3
+
+
+class TestDownloadArchive:
+    """Tests for the in-memory download archive helpers."""
+    
+    def test_load_download_archive(self, tmp_path):
+        """Archive lines are loaded into a set, ignoring blank lines."""
+        archive_path = tmp_path / "archive.txt"
+        archive_path.write_text("mixcloud user_mix-one\n\nmixcloud user_mix-two\n")
+        
+        assert load_download_archive(archive_path) == {"mixcloud user_mix-one", "mixcloud user_mix-two"}
+    
+    def test_load_missing_archive(self, tmp_path):
+        """Missing archive file yields an empty set."""
+        assert load_download_archive(tmp_path / "missing.txt") == set()
+    
+    def test_archive_id_for_url(self):
+        """Archive ID matches yt-dlp's 'mixcloud <user>_<slug>' format."""
+        assert archive_id_for_url("https://www.mixcloud.com/DJ/cool-mix/") == "mixcloud DJ_cool-mix"
+        assert archive_id_for_url("https://www.mixcloud.com/user/fat-tez-%C3%A6lfgifu/") == "mixcloud user_fat-tez-ælfgifu"
+        assert archive_id_for_url("not a url") is None
+    
+    def test_skips_archived_track_without_ytdlp(self, mock_ytdl, tmp_path):
+        """Tracks already in the archive set never construct a YoutubeDL."""
+        archive = {"mixcloud user_mix"}
+        
+        result = download_track("https://www.mixcloud.com/user/mix/", tmp_path, tmp_path / "archive.txt", 'unknown', archive=archive)
+        
+        assert result is None
+        mixcloud_downloader.yt_dlp.YoutubeDL.assert_not_called()
+    
+    def test_returns_existing_file_for_archived_track(self, mock_ytdl, tmp_path):
+        """Archived tracks resolve to the existing file when info is known."""
+        info = {'uploader': 'DJ', 'upload_date': '20240101', 'title': 'Mix', 'ext': 'opus'}
+        existing = tmp_path / "DJ" / "Uploads" / "20240101 - Mix.opus"
+        existing.parent.mkdir(parents=True)
+        existing.touch()
+        
+        result = download_track("https://www.mixcloud.com/DJ/mix/", tmp_path, tmp_path / "archive.txt", 'unknown', "Uploads", info, archive={"mixcloud DJ_mix"})
+        
+        assert result == existing
+        mixcloud_downloader.yt_dlp.YoutubeDL.assert_not_called()
+
+
+class TestDownloadTrack:
+    """Tests for download_track yt-dlp invocation."""
+    
+    def test_reuses_info_instead_of_reextracting(self, mock_ytdl, tmp_path):
+        """Known track info is handed to yt-dlp instead of the URL."""
+        mock_ytdl.sanitize_info.side_effect = lambda info, remove_private_keys=False: dict(info)
+        info = {'uploader': 'DJ', 'upload_date': '20240101', 'title': 'Mix', 'ext': 'opus'}
+        
+        download_track("https://www.mixcloud.com/DJ/mix/", tmp_path, tmp_path / "archive.txt", 'unknown', "Uploads", info)
+        
+        mock_ytdl.process_ie_result.assert_called_once_with(info, download=True)
+        mock_ytdl.download.assert_not_called()
+    
+    def test_downloads_url_without_info(self, mock_ytdl, tmp_path):
+        """Without track info the URL is extracted by yt-dlp."""
+        download_track("https://www.mixcloud.com/DJ/mix/", tmp_path, tmp_path / "archive.txt", 'unknown')
+        
+        mock_ytdl.download.assert_called_once_with(["https://www.mixcloud.com/DJ/mix/"])
+        mock_ytdl.process_ie_result.assert_not_called()
+    
+    def test_falls_back_to_url_when_cached_info_fails(self, mock_ytdl, tmp_path):
+        """A download error from the cached info retries by extracting the URL."""
+        DownloadError = mixcloud_downloader.yt_dlp.utils.DownloadError
+        mock_ytdl.process_ie_result.side_effect = DownloadError("ERROR: format expired")
+        info = {'uploader': 'DJ', 'upload_date': '20240101', 'title': 'Mix', 'ext': 'opus'}
+        
+        download_track("https://www.mixcloud.com/DJ/mix/", tmp_path, tmp_path / "archive.txt", 'unknown', "Uploads", info)
+        
+        mock_ytdl.process_ie_result.assert_called_once()
+        mock_ytdl.download.assert_called_once_with(["https://www.mixcloud.com/DJ/mix/"])
+    
+    def test_archive_hit_is_not_retried(self, mock_ytdl, tmp_path):
+        """An 'already recorded' error is reported as archived, not re-extracted."""
+        DownloadError = mixcloud_downloader.yt_dlp.utils.DownloadError
+        mock_ytdl.process_ie_result.side_effect = DownloadError("mix has already been recorded in the archive")
+        info = {'uploader': 'DJ', 'upload_date': '20240101', 'title': 'Mix', 'ext': 'opus'}
+        
+        with patch.object(mixcloud_downloader, "get_console") as get_console:
+            result = download_track("https://www.mixcloud.com/DJ/mix/", tmp_path, tmp_path / "archive.txt", 'unknown', "Uploads", info)
+        
+        assert result is None
+        mock_ytdl.download.assert_not_called()
+        get_console.return_value.info.assert_any_call("  (already in archive)")
+
+
+class TestLazyImports:
+    """yt-dlp is only imported once a download function needs it."""
+    
+    def test_import_skips_yt_dlp(self):
+        """Importing the module leaves yt-dlp unloaded until first access."""
+        src_dir = Path(__file__).resolve().parent.parent / "src"
+        code = (
+            "import sys, mixcloud_downloader; "
+            "before = 'yt_dlp' in sys.modules; "
+            "mixcloud_downloader.yt_dlp; "
+            "print(before, 'yt_dlp' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=src_dir, capture_output=True, text=True, check=True,
+        )
+        
+        assert result.stdout.strip() == "False True"
@@ -2,10 +2,14 @@
 Unit tests for mixcloud_match_to_lrc.py LRC generator.
 """
 
+from types import MappingProxyType, SimpleNamespace
+
 import pytest
 from pathlib import Path
-from unittest.mock import patch, Mock, MagicMock
+from unittest.mock import call, patch, Mock
 
+import mixcloud_match_to_lrc
+from console import ConsoleOutput, get_console
 from mixcloud_match_to_lrc import (
     process_mp3,
     walk,
@@ -17,43 +21,133 @@ from mixcloud_match_to_lrc import (
 )
 
 
+@pytest.fixture(scope="module")
+def audio_dir(tmp_path_factory):
+    """
+    Shared directory for tests whose audio file is never opened for real.
+    
+    mutagen and the embedders are mocked in these tests, so the audio path
+    only needs a suffix and a parent; nothing is created or written there.
+    """
+    return tmp_path_factory.mktemp("audio")
+
+
+@pytest.fixture(scope="module")
+def walk_tree(tmp_path_factory):
+    """
+    Read-only directory tree for walk() tests, created once per module.
+    
+    Four supported audio files (one in a subdirectory) plus two files walk()
+    must ignore.
+    """
+    root = tmp_path_factory.mktemp("walk")
+    (root / "subdir").mkdir()
+    for name in ("file1.mp3", "file2.m4a", "file3.opus", "subdir/file4.ogg", "audio.wav", "readme.txt"):
+        (root / name).touch()
+    return root
+
+
+@pytest.fixture
+def console(monkeypatch):
+    """
+    Replace the module's console with a recording Mock.
+    
+    Tests assert on the exact message passed to warn()/info()/error() rather
+    than rendering it through Rich and scanning captured stdout.
+    """
+    console = Mock(spec=ConsoleOutput)
+    monkeypatch.setattr(mixcloud_match_to_lrc, "get_console", lambda: console)
+    return console
+
+
+@pytest.fixture
+def mock_file(monkeypatch):
+    """Replace mutagen's File() in mixcloud_match_to_lrc with a Mock."""
+    file = Mock()
+    monkeypatch.setattr(mixcloud_match_to_lrc, "File", file)
+    return file
+
+
+@pytest.fixture
+def mock_fetch(monkeypatch):
+    """Replace the tracklist API call in mixcloud_match_to_lrc with a Mock."""
+    fetch = Mock()
+    monkeypatch.setattr(mixcloud_match_to_lrc, "fetch_tracklist", fetch)
+    return fetch
+
+
 def create_mock_audio(tags=None, duration=3600.0):
-    """Helper to create a mock mutagen audio file."""
-    mock_audio = MagicMock()
-    mock_audio.tags = tags
-    mock_audio.info.length = duration
-    return mock_audio
+    """Stand-in for a mutagen File: only .tags and .info.length are read."""
+    return SimpleNamespace(tags=tags, info=SimpleNamespace(length=duration))
 
 
 def create_mock_tags_txxx(url):
     """Create mock tags with TXXX:purl field (most common format)."""
-    mock_purl = MagicMock()
-    mock_purl.text = [url]
-    return {"TXXX:purl": mock_purl}
+    return {"TXXX:purl": SimpleNamespace(text=[url])}
+
+
+def _track(start, artist, song):
+    """Read-only TrackSection as returned by fetch_tracklist."""
+    return MappingProxyType({"__typename": "TrackSection", "startSeconds": start, "artistName": artist, "songName": song})
+
+
+def _chapter(start, chapter):
+    """Read-only ChapterSection as returned by fetch_tracklist."""
+    return MappingProxyType({"__typename": "ChapterSection", "startSeconds": start, "chapter": chapter})
+
+
+_TWO_TRACKS = (_track(0, "Artist One", "Song One"), _track(180.5, "Artist Two", "Song Two"))
+_THREE_TRACKS = tuple(_track(start, f"Artist {i}", f"Song {i}") for i, start in enumerate((0, 180.5, 360), 1))
+_TWO_CHAPTERS = (_chapter(0, "Introduction"), _chapter(300, "Main Set"))
+_MIXED_SECTIONS = (_chapter(0, "Intro"), _track(60, "Artist", "Track"))
+_TWELVE_TRACKS = tuple(_track(i * 50, f"Artist {i+1}", f"Song {i+1}") for i in range(12))
+# process_audio_with_url fills in startSeconds in place, so tests pass a fresh copy
+_THREE_UNTIMED = tuple(_track(None, f"A{i}", f"S{i}") for i in range(1, 4))
+
+# (sections, expected LRC lines) cases for generate_lrc_content
+GENERATE_LRC_CASES = (
+    pytest.param(_TWO_TRACKS, ("[00:00.00] 01. Artist One – Song One", "[03:00.50] 02. Artist Two – Song Two"), id="tracks"),
+    # ChapterSection uses the chapter field instead of artist/song
+    pytest.param(_TWO_CHAPTERS, ("[00:00.00] 01. Introduction", "[05:00.00] 02. Main Set"), id="chapters"),
+    pytest.param(_MIXED_SECTIONS, ("[00:00.00] 01. Intro", "[01:00.00] 02. Artist – Track"), id="mixed"),
+    # Track numbers are zero-padded to two digits
+    pytest.param(_TWELVE_TRACKS, ("[00:00.00] 01. Artist 1 – Song 1", "[06:40.00] 09. Artist 9 – Song 9", "[07:30.00] 10. Artist 10 – Song 10", "[09:10.00] 12. Artist 12 – Song 12"), id="zero-padded"),
+)
+
+# (tags, expected URL) cases for extract_mixcloud_url; ID3 frames expose .text or .url
+EXTRACT_URL_CASES = (
+    pytest.param({"TXXX:purl": SimpleNamespace(text=["https://mixcloud.com/user/mix/"])}, "https://mixcloud.com/user/mix/", id="txxx-purl"),
+    # Frame keys are matched case-insensitively
+    pytest.param({"wXxX:pUrL": SimpleNamespace(url="https://mixcloud.com/user/wxxx/")}, "https://mixcloud.com/user/wxxx/", id="wxxx-case-insensitive"),
+    pytest.param({"purl": ["https://mixcloud.com/user/purl/"]}, "https://mixcloud.com/user/purl/", id="purl"),
+    pytest.param({"url": ["https://mixcloud.com/user/url/"]}, "https://mixcloud.com/user/url/", id="url"),
+    # Comments are returned whole, surrounding text included
+    pytest.param({"comment": ["see https://mixcloud.com/user/comment/"]}, "see https://mixcloud.com/user/comment/", id="comment"),
+    pytest.param({"comment": ["not a match"]}, None, id="no-mixcloud"),
+)
+
+# (suffix, mutagen class patched in mixcloud_match_to_lrc, lyrics tag key) for embed_lyrics_any
+EMBED_DISPATCH_CASES = (
+    pytest.param(".m4a", "MP4", "\xa9lyr", id="mp4"),
+    pytest.param(".mp4", "MP4", "\xa9lyr", id="mp4-video-container"),
+    pytest.param(".opus", "OggOpus", "lyrics", id="ogg-opus"),
+)
 
 
 class TestProcessMp3:
     """Tests for process_mp3 function."""
     
-    @patch('mixcloud_match_to_lrc.fetch_tracklist')
-    @patch('mixcloud_match_to_lrc.File')
     def test_generates_lrc_file(self, mock_file, mock_fetch, tmp_path):
         """Successfully generates LRC file when write_file=True."""
-        # Setup mock audio file
+        # File() is mocked, so the .mp3 itself never needs to exist
         mp3_path = tmp_path / "test-mix.mp3"
-        mp3_path.touch()
         
         mock_file.return_value = create_mock_audio(
             tags=create_mock_tags_txxx("https://mixcloud.com/user/test-mix/"),
             duration=600.0
         )
         
-        # Setup mock API response
-        mock_fetch.return_value = [
-            {"__typename": "TrackSection", "startSeconds": 0, "artistName": "Artist 1", "songName": "Song 1"},
-            {"__typename": "TrackSection", "startSeconds": 180.5, "artistName": "Artist 2", "songName": "Song 2"},
-            {"__typename": "TrackSection", "startSeconds": 360, "artistName": "Artist 3", "songName": "Song 3"},
-        ]
+        mock_fetch.return_value = _THREE_TRACKS
         
         process_mp3(mp3_path, embed=False, write_file=True)
         
@@ -69,131 +163,62 @@ class TestProcessMp3:
         assert "02. Artist 2 – Song 2" in content
         assert "03. Artist 3 – Song 3" in content
     
-    @patch('mixcloud_match_to_lrc.fetch_tracklist')
-    @patch('mixcloud_match_to_lrc.File')
-    def test_track_numbering_format(self, mock_file, mock_fetch, tmp_path):
-        """Track numbers are zero-padded (01, 02, etc.)."""
-        mp3_path = tmp_path / "mix.mp3"
-        mp3_path.touch()
-        
-        mock_file.return_value = create_mock_audio(
-            tags=create_mock_tags_txxx("https://mixcloud.com/user/mix/"),
-            duration=600.0
-        )
-        
-        # Create 12 tracks to verify padding
-        mock_fetch.return_value = [
-            {"__typename": "TrackSection", "startSeconds": i * 50, "artistName": f"Artist {i+1}", "songName": f"Song {i+1}"}
-            for i in range(12)
-        ]
-        
-        process_mp3(mp3_path, embed=False, write_file=True)
-        
-        content = (tmp_path / "mix.lrc").read_text()
-        assert "01. Artist 1" in content
-        assert "09. Artist 9" in content
-        assert "10. Artist 10" in content
-        assert "12. Artist 12" in content
-    
-    @patch('mixcloud_match_to_lrc.fetch_tracklist')
-    @patch('mixcloud_match_to_lrc.File')
-    def test_chapter_sections(self, mock_file, mock_fetch, tmp_path):
-        """ChapterSection types use chapter field instead of artist/song."""
-        mp3_path = tmp_path / "podcast.mp3"
-        mp3_path.touch()
-        
-        mock_file.return_value = create_mock_audio(
-            tags=create_mock_tags_txxx("https://mixcloud.com/user/podcast/"),
-            duration=3600.0
-        )
-        
-        mock_fetch.return_value = [
-            {"__typename": "ChapterSection", "startSeconds": 0, "chapter": "Introduction"},
-            {"__typename": "ChapterSection", "startSeconds": 600, "chapter": "Main Topic"},
-        ]
-        
-        process_mp3(mp3_path, embed=False, write_file=True)
-        
-        content = (tmp_path / "podcast.lrc").read_text()
-        assert "01. Introduction" in content
-        assert "02. Main Topic" in content
-    
-    @patch('mixcloud_match_to_lrc.File')
-    def test_skips_file_without_tags(self, mock_file, tmp_path, capsys):
+    def test_skips_file_without_tags(self, mock_file, audio_dir, console):
         """Files without tags are skipped."""
-        mp3_path = tmp_path / "no-tags.mp3"
-        mp3_path.touch()
+        mp3_path = audio_dir / "no-tags.mp3"
         
-        mock_audio = MagicMock()
-        mock_audio.tags = None
-        mock_file.return_value = mock_audio
+        mock_file.return_value = create_mock_audio(tags=None)
         
         process_mp3(mp3_path)
         
         # No LRC file created
-        assert not (tmp_path / "no-tags.lrc").exists()
+        assert not (audio_dir / "no-tags.lrc").exists()
         
         # Check skip message
-        captured = capsys.readouterr()
-        assert "Skipping (no tags in file)" in captured.out
+        console.warn.assert_called_once_with("  Skipping (no tags in file)")
     
-    @patch('mixcloud_match_to_lrc.File')
-    def test_skips_file_without_mixcloud_url(self, mock_file, tmp_path, capsys):
+    def test_skips_file_without_mixcloud_url(self, mock_file, audio_dir, console):
         """Files without Mixcloud URL in tags are skipped."""
-        mp3_path = tmp_path / "no-url.mp3"
-        mp3_path.touch()
+        mp3_path = audio_dir / "no-url.mp3"
         
         # Tags exist but no Mixcloud URL
         mock_file.return_value = create_mock_audio(tags={"TIT2": "Some Title"})
         
         process_mp3(mp3_path)
         
-        assert not (tmp_path / "no-url.lrc").exists()
-        captured = capsys.readouterr()
-        assert "Skipping (no Mixcloud URL in tags)" in captured.out
+        assert not (audio_dir / "no-url.lrc").exists()
+        console.warn.assert_called_once_with("  Skipping (no Mixcloud URL in tags)")
     
-    @patch('mixcloud_match_to_lrc.fetch_tracklist')
-    @patch('mixcloud_match_to_lrc.File')
-    def test_skips_single_section(self, mock_file, mock_fetch, tmp_path, capsys):
+    def test_skips_single_section(self, mock_file, mock_fetch, audio_dir, console):
         """Files with fewer than 2 sections are skipped."""
-        mp3_path = tmp_path / "one-track.mp3"
-        mp3_path.touch()
+        mp3_path = audio_dir / "one-track.mp3"
         
         mock_file.return_value = create_mock_audio(
             tags=create_mock_tags_txxx("https://mixcloud.com/user/mix/")
         )
-        mock_fetch.return_value = [
-            {"__typename": "TrackSection", "startSeconds": 0, "artistName": "Solo", "songName": "Track"}
-        ]
+        mock_fetch.return_value = _TWO_TRACKS[:1]
         
         process_mp3(mp3_path)
         
-        assert not (tmp_path / "one-track.lrc").exists()
-        captured = capsys.readouterr()
-        assert "Skipping (only 1 section" in captured.out
+        assert not (audio_dir / "one-track.lrc").exists()
+        console.warn.assert_called_once_with("  Skipping (only 1 section(s) in tracklist)")
     
-    @patch('mixcloud_match_to_lrc.fetch_tracklist')
-    @patch('mixcloud_match_to_lrc.File')
-    def test_calculates_timestamps_when_missing(self, mock_file, mock_fetch, tmp_path, capsys):
+    @patch.object(mixcloud_match_to_lrc, 'embed_lyrics_any', return_value=True)
+    def test_calculates_timestamps_when_missing(self, mock_embed, mock_file, mock_fetch, audio_dir, console):
         """Evenly-spaced timestamps calculated when API lacks timing data."""
-        mp3_path = tmp_path / "no-timing.mp3"
-        mp3_path.touch()
+        mp3_path = audio_dir / "no-timing.mp3"
         
         mock_file.return_value = create_mock_audio(
             tags=create_mock_tags_txxx("https://mixcloud.com/user/mix/"),
             duration=600.0  # 10 minutes
         )
         
-        # Sections without startSeconds
-        mock_fetch.return_value = [
-            {"__typename": "TrackSection", "startSeconds": None, "artistName": "A1", "songName": "S1"},
-            {"__typename": "TrackSection", "startSeconds": None, "artistName": "A2", "songName": "S2"},
-            {"__typename": "TrackSection", "startSeconds": None, "artistName": "A3", "songName": "S3"},
-        ]
+        mock_fetch.return_value = [dict(section) for section in _THREE_UNTIMED]
         
-        process_mp3(mp3_path, embed=False, write_file=True)
+        process_mp3(mp3_path)
         
-        content = (tmp_path / "no-timing.lrc").read_text()
+        # LRC content is checked as handed to the embedder; nothing touches disk
+        (_, content), _ = mock_embed.call_args
         
         # 3 tracks over 600 seconds = 200 second intervals
         # Track 1 at 0:00, Track 2 at 3:20 (200s), Track 3 at 6:40 (400s)
@@ -201,28 +226,34 @@ class TestProcessMp3:
         assert "[03:20.00]" in content
         assert "[06:40.00]" in content
         
-        captured = capsys.readouterr()
-        assert "calculating evenly-spaced timestamps" in captured.out
-    
-    @patch('mixcloud_match_to_lrc.fetch_tracklist')
-    @patch('mixcloud_match_to_lrc.File')
+        console.info.assert_any_call("  No timing data - calculating evenly-spaced timestamps over 10:00")
+
+    def test_skips_without_timing_or_duration(self, mock_file, mock_fetch, audio_dir, console):
+        """Files are skipped when neither API timing nor audio duration exist."""
+        mp3_path = audio_dir / "no-duration.mp3"
+
+        mock_file.return_value = create_mock_audio(
+            tags=create_mock_tags_txxx("https://mixcloud.com/user/mix/"),
+            duration=None
+        )
+        # Skipped before timestamps are filled in, so the shared sections stay untouched
+        mock_fetch.return_value = _THREE_UNTIMED[:2]
+
+        process_mp3(mp3_path, embed=False, write_file=True)
+
+        assert not (audio_dir / "no-duration.lrc").exists()
+        console.warn.assert_called_once_with("  Skipping (no timing information and no audio duration)")
+
     def test_wpub_tag_extraction(self, mock_file, mock_fetch, tmp_path):
         """WPUB tag is used for Mixcloud URL."""
         mp3_path = tmp_path / "wpub.mp3"
-        mp3_path.touch()
-        
-        mock_wpub = MagicMock()
-        mock_wpub.url = "https://mixcloud.com/user/wpub-mix/"
         
         mock_file.return_value = create_mock_audio(
-            tags={"WPUB": mock_wpub},
+            tags={"WPUB": SimpleNamespace(url="https://mixcloud.com/user/wpub-mix/")},
             duration=600.0
         )
         
-        mock_fetch.return_value = [
-            {"__typename": "TrackSection", "startSeconds": 0, "artistName": "A", "songName": "S"},
-            {"__typename": "TrackSection", "startSeconds": 300, "artistName": "B", "songName": "T"},
-        ]
+        mock_fetch.return_value = _TWO_TRACKS
         
         process_mp3(mp3_path, embed=False, write_file=True)
         
@@ -233,100 +264,68 @@ class TestProcessMp3:
 class TestWalk:
     """Tests for walk directory scanning function."""
     
-    @patch('mixcloud_match_to_lrc.process_audio_from_tags')
-    def test_processes_supported_audio_files(self, mock_process, tmp_path):
-        """Walk finds and processes supported audio files."""
-        (tmp_path / "file1.mp3").touch()
-        (tmp_path / "file2.m4a").touch()
-        (tmp_path / "file3.opus").touch()
-        (tmp_path / "subdir").mkdir()
-        (tmp_path / "subdir" / "file4.ogg").touch()
-        
-        walk(str(tmp_path))
+    @pytest.fixture
+    def mock_process(self, monkeypatch):
+        """Replace the per-file worker so walk() only exercises discovery."""
+        process = Mock()
+        monkeypatch.setattr(mixcloud_match_to_lrc, "process_audio_from_tags", process)
+        return process
+    
+    def test_processes_supported_audio_files(self, mock_process, walk_tree):
+        """Walk finds supported audio files, including in subdirectories."""
+        walk(str(walk_tree))
         
-        assert mock_process.call_count == 4
+        processed = {call.args[0].relative_to(walk_tree).as_posix() for call in mock_process.call_args_list}
+        assert processed == {"file1.mp3", "file2.m4a", "file3.opus", "subdir/file4.ogg"}
     
-    @patch('mixcloud_match_to_lrc.process_audio_from_tags')
-    def test_ignores_unsupported_files(self, mock_process, tmp_path):
+    def test_ignores_unsupported_files(self, mock_process, walk_tree):
         """Walk ignores unsupported file extensions."""
-        (tmp_path / "audio.mp3").touch()
-        (tmp_path / "audio.wav").touch()
-        (tmp_path / "readme.txt").touch()
+        walk(str(walk_tree))
         
-        walk(str(tmp_path))
-        
-        assert mock_process.call_count == 1
+        suffixes = {call.args[0].suffix for call in mock_process.call_args_list}
+        assert not suffixes & {".wav", ".txt"}
     
-    @patch('mixcloud_match_to_lrc.process_audio_from_tags')
-    def test_continues_on_error(self, mock_process, tmp_path, capsys):
+    def test_continues_on_error(self, mock_process, walk_tree, console):
         """Walk continues processing after individual file errors."""
-        (tmp_path / "file1.mp3").touch()
-        (tmp_path / "file2.mp3").touch()
-        (tmp_path / "file3.mp3").touch()
-        
         # First file raises error, others succeed
-        mock_process.side_effect = [Exception("Test error"), None, None]
+        mock_process.side_effect = [Exception("Test error"), None, None, None]
         
-        walk(str(tmp_path))
+        walk(str(walk_tree))
         
-        # All 3 files attempted
-        assert mock_process.call_count == 3
+        # All 4 supported files attempted
+        assert mock_process.call_count == 4
         
         # Error logged
-        captured = capsys.readouterr()
-        assert "Error on" in captured.out
-        assert "Test error" in captured.out
+        [message] = [call.args[0] for call in console.error.call_args_list]
+        assert message.startswith(f"Error on {walk_tree}")
+        assert message.endswith(": Test error")
+    
+    def test_file_output_printed_under_its_path(self, mock_process, walk_tree, console):
+        """Each worker's messages are printed as one block after the file's path."""
+        mock_process.side_effect = lambda path, **kwargs: get_console().warn(f"  Skipping {path.name}")
+        
+        walk(str(walk_tree))
+        
+        calls = console.mock_calls
+        for path in [c.args[0] for c in mock_process.call_args_list]:
+            header = calls.index(call.print(str(path)))
+            assert calls[header + 1] == call.warn(f"  Skipping {path.name}")
 
 
 class TestGenerateLrcContent:
     """Tests for generate_lrc_content function."""
     
-    def test_basic_track_sections(self):
-        """Generate LRC from track sections."""
-        sections = [
-            {"__typename": "TrackSection", "startSeconds": 0, "artistName": "Artist One", "songName": "Song One"},
-            {"__typename": "TrackSection", "startSeconds": 180.5, "artistName": "Artist Two", "songName": "Song Two"},
-        ]
-        
-        content = generate_lrc_content("testuser", "Test Mix", sections)
-        
-        assert "[ar:testuser]" in content
-        assert "[ti:Test Mix]" in content
-        assert "[00:00.00] 01. Artist One – Song One" in content
-        assert "[03:00.50] 02. Artist Two – Song Two" in content
-    
-    def test_chapter_sections(self):
-        """Generate LRC from chapter sections."""
-        sections = [
-            {"__typename": "ChapterSection", "startSeconds": 0, "chapter": "Introduction"},
-            {"__typename": "ChapterSection", "startSeconds": 300, "chapter": "Main Set"},
-        ]
-        
-        content = generate_lrc_content("dj", "Podcast", sections)
-        
-        assert "[00:00.00] 01. Introduction" in content
-        assert "[05:00.00] 02. Main Set" in content
-    
-    def test_mixed_sections(self):
-        """Generate LRC from mixed section types."""
-        sections = [
-            {"__typename": "ChapterSection", "startSeconds": 0, "chapter": "Intro"},
-            {"__typename": "TrackSection", "startSeconds": 60, "artistName": "Artist", "songName": "Track"},
-        ]
-        
-        content = generate_lrc_content("user", "Mix", sections)
+    @pytest.mark.parametrize("sections,expected_lines", GENERATE_LRC_CASES)
+    def test_section_lines(self, sections, expected_lines):
+        """Each section becomes a timestamped, numbered LRC line."""
+        lines = generate_lrc_content("user", "Mix", sections).splitlines()
         
-        assert "[00:00.00] 01. Intro" in content
-        assert "[01:00.00] 02. Artist – Track" in content
+        for expected in expected_lines:
+            assert expected in lines
     
     def test_header_format(self):
         """LRC header includes artist and title tags."""
-        sections = [
-            {"__typename": "TrackSection", "startSeconds": 0, "artistName": "A", "songName": "B"},
-            {"__typename": "TrackSection", "startSeconds": 60, "artistName": "C", "songName": "D"},
-        ]
-        
-        content = generate_lrc_content("myuser", "My Mix Title", sections)
+        content = generate_lrc_content("myuser", "My Mix Title", _TWO_TRACKS)
         
         lines = content.split('\n')
         assert lines[0] == "[ar:myuser]"
@@ -337,12 +336,15 @@ class TestGenerateLrcContent:
 class TestEmbedLyrics:
     """Tests for embed_lyrics function."""
     
-    @patch('mixcloud_match_to_lrc.ID3')
-    def test_embed_success(self, mock_id3_class):
+    @pytest.fixture
+    def mock_audio(self, monkeypatch):
+        """Patch ID3 so loading any file returns one recording Mock."""
+        audio = Mock()
+        monkeypatch.setattr(mixcloud_match_to_lrc, "ID3", Mock(return_value=audio))
+        return audio
+    
+    def test_embed_success(self, mock_audio):
         """Successfully embed lyrics."""
-        mock_audio = MagicMock()
-        mock_id3_class.return_value = mock_audio
-        
         result = embed_lyrics(Path("/test/file.mp3"), "[ar:test]\nLyrics content")
         
         assert result is True
@@ -350,87 +352,57 @@ class TestEmbedLyrics:
         mock_audio.add.assert_called_once()
         mock_audio.save.assert_called_once()
     
-    @patch('mixcloud_match_to_lrc.ID3')
-    def test_embed_removes_existing_uslt(self, mock_id3_class):
+    def test_embed_removes_existing_uslt(self, mock_audio):
         """Existing USLT tags are removed before adding new one."""
-        mock_audio = MagicMock()
-        mock_id3_class.return_value = mock_audio
-        
         embed_lyrics(Path("/test/file.mp3"), "content")
         
         # Verify delall called before add
+        assert [name for name, _, _ in mock_audio.method_calls][:2] == ['delall', 'add']
         mock_audio.delall.assert_called_once_with('USLT')
-        mock_audio.add.assert_called_once()
     
-    @patch('mixcloud_match_to_lrc.ID3')
-    def test_embed_failure_returns_false(self, mock_id3_class):
+    def test_embed_failure_returns_false(self, mock_audio):
         """Returns False on save error."""
-        mock_audio = MagicMock()
         mock_audio.save.side_effect = Exception("Write error")
-        mock_id3_class.return_value = mock_audio
         
         result = embed_lyrics(Path("/test/file.mp3"), "content")
         
         assert result is False
     
-    @patch('mixcloud_match_to_lrc.ID3')
-    def test_embed_creates_new_id3_on_load_error(self, mock_id3_class):
+    def test_embed_creates_new_id3_on_load_error(self, mock_audio):
         """Creates new ID3 object if file has no tags."""
         # First call raises (loading existing), second returns new mock
-        mock_audio = MagicMock()
-        mock_id3_class.side_effect = [Exception("No ID3 header"), mock_audio]
+        mixcloud_match_to_lrc.ID3.side_effect = [Exception("No ID3 header"), mock_audio]
         
         result = embed_lyrics(Path("/test/file.mp3"), "content")
         
         # Should have tried twice: first load, then create new
-        assert mock_id3_class.call_count == 2
+        assert mixcloud_match_to_lrc.ID3.call_count == 2
         assert result is True
 
 
 class TestEmbedLyricsAny:
     """Tests for embed_lyrics_any multi-format embedding."""
     
-    @patch('mixcloud_match_to_lrc.MP4')
-    def test_embeds_mp4_lyrics(self, mock_mp4_class, tmp_path):
-        """Writes MP4 lyrics to ©lyr tag."""
-        audio_path = tmp_path / "test.m4a"
-        audio_path.touch()
-        
-        mock_audio = MagicMock()
-        mock_audio.tags = {}
-        mock_mp4_class.return_value = mock_audio
+    @pytest.mark.parametrize("suffix,cls_name,tag_key", EMBED_DISPATCH_CASES)
+    def test_embeds_by_container(self, suffix, cls_name, tag_key, audio_dir, monkeypatch):
+        """Each container's lyrics are written by its mutagen class under its tag key."""
+        mock_audio = Mock(tags={})
+        monkeypatch.setattr(mixcloud_match_to_lrc, cls_name, Mock(return_value=mock_audio))
         
-        result = embed_lyrics_any(audio_path, "lrc content")
+        result = embed_lyrics_any(audio_dir / f"test{suffix}", "lrc content")
         
         assert result is True
-        assert "\xa9lyr" in mock_audio.tags
+        assert mock_audio.tags == {tag_key: ["lrc content"]}
         mock_audio.save.assert_called_once()
     
-    @patch('mixcloud_match_to_lrc.OggOpus')
-    def test_embeds_ogg_opus_lyrics(self, mock_ogg_opus_class, tmp_path):
-        """Writes Ogg Opus lyrics to vorbis comment."""
-        audio_path = tmp_path / "test.opus"
-        audio_path.touch()
-        
-        mock_audio = MagicMock()
-        mock_audio.tags = {}
-        mock_ogg_opus_class.return_value = mock_audio
-        
-        result = embed_lyrics_any(audio_path, "lrc content")
-        
-        assert result is True
-        assert "lyrics" in mock_audio.tags
-        mock_audio.save.assert_called_once()
-    
-    @patch('mixcloud_match_to_lrc.OggVorbis')
-    @patch('mixcloud_match_to_lrc.OggOpus')
-    def test_falls_back_to_ogg_vorbis(self, mock_ogg_opus_class, mock_ogg_vorbis_class, tmp_path):
+    @patch.object(mixcloud_match_to_lrc, 'OggVorbis')
+    @patch.object(mixcloud_match_to_lrc, 'OggOpus')
+    def test_falls_back_to_ogg_vorbis(self, mock_ogg_opus_class, mock_ogg_vorbis_class, audio_dir):
         """Falls back to Ogg Vorbis when Ogg Opus fails."""
-        audio_path = tmp_path / "test.ogg"
-        audio_path.touch()
+        audio_path = audio_dir / "test.ogg"
         
         mock_ogg_opus_class.side_effect = Exception("Not Opus")
-        mock_audio = MagicMock()
+        mock_audio = Mock()
         mock_audio.tags = {}
         mock_ogg_vorbis_class.return_value = mock_audio
         
@@ -440,10 +412,9 @@ class TestEmbedLyricsAny:
         assert "lyrics" in mock_audio.tags
         mock_audio.save.assert_called_once()
     
-    def test_returns_false_for_unsupported(self, tmp_path):
+    def test_returns_false_for_unsupported(self, audio_dir):
         """Returns False for unsupported formats."""
-        audio_path = tmp_path / "test.wav"
-        audio_path.touch()
+        audio_path = audio_dir / "test.wav"
         
         result = embed_lyrics_any(audio_path, "lrc content")
         
@@ -453,44 +424,26 @@ class TestEmbedLyricsAny:
 class TestExtractMixcloudUrl:
     """Tests for extract_mixcloud_url helper."""
     
-    def test_extracts_from_txxx_purl(self):
-        mock_purl = MagicMock()
-        mock_purl.text = ["https://mixcloud.com/user/mix/"]
-        tags = {"TXXX:purl": mock_purl}
-        
-        assert extract_mixcloud_url(tags) == "https://mixcloud.com/user/mix/"
+    @pytest.mark.parametrize("tags,expected", EXTRACT_URL_CASES)
+    def test_extract_mixcloud_url(self, tags, expected):
+        """The first tag field holding a Mixcloud URL wins."""
+        assert extract_mixcloud_url(tags) == expected
     
-    def test_extracts_from_wxxx_case_insensitive(self):
-        mock_wxxx = MagicMock()
-        mock_wxxx.url = "https://mixcloud.com/user/wxxx/"
-        tags = {"wXxX:pUrL": mock_wxxx}
+    def test_exact_key_hit_skips_index(self, monkeypatch):
+        """The case-insensitive key index is not built when an exact key matches."""
+        index = Mock(side_effect=AssertionError("index built"))
+        monkeypatch.setattr(mixcloud_match_to_lrc, "_lowercase_tag_index", index)
+        tags = {"Other": ["x"], "purl": ["https://mixcloud.com/user/mix/"]}
         
-        assert extract_mixcloud_url(tags) == "https://mixcloud.com/user/wxxx/"
-    
-    def test_extracts_from_purl_or_url(self):
-        tags = {"purl": ["https://mixcloud.com/user/purl/"]}
-        assert extract_mixcloud_url(tags) == "https://mixcloud.com/user/purl/"
-        
-        tags = {"url": ["https://mixcloud.com/user/url/"]}
-        assert extract_mixcloud_url(tags) == "https://mixcloud.com/user/url/"
-    
-    def test_extracts_from_comment(self):
-        tags = {"comment": ["see https://mixcloud.com/user/comment/"]}
-        assert extract_mixcloud_url(tags) == "see https://mixcloud.com/user/comment/"
-    
-    def test_returns_none_without_mixcloud(self):
-        tags = {"comment": ["not a match"]}
-        assert extract_mixcloud_url(tags) is None
+        assert extract_mixcloud_url(tags) == "https://mixcloud.com/user/mix/"
 
 
 class TestProcessAudioFromTags:
     """Tests for process_audio_from_tags wrapper."""
     
-    @patch('mixcloud_match_to_lrc.process_audio_with_url')
-    @patch('mixcloud_match_to_lrc.File')
-    def test_processes_when_url_present(self, mock_file, mock_process, tmp_path):
-        audio_path = tmp_path / "test.m4a"
-        audio_path.touch()
+    @patch.object(mixcloud_match_to_lrc, 'process_audio_with_url')
+    def test_processes_when_url_present(self, mock_process, mock_file, audio_dir):
+        audio_path = audio_dir / "test.m4a"
         
         tags = {"purl": ["https://mixcloud.com/user/mix/"]}
         mock_file.return_value = create_mock_audio(tags=tags)
@@ -499,16 +452,11 @@ class TestProcessAudioFromTags:
         
         mock_process.assert_called_once_with(audio_path, "https://mixcloud.com/user/mix/", embed=True, write_file=False)
     
-    @patch('mixcloud_match_to_lrc.File')
-    def test_skips_when_no_tags(self, mock_file, tmp_path, capsys):
-        audio_path = tmp_path / "test.m4a"
-        audio_path.touch()
+    def test_skips_when_no_tags(self, mock_file, audio_dir, console):
+        audio_path = audio_dir / "test.m4a"
         
-        mock_audio = MagicMock()
-        mock_audio.tags = None
-        mock_file.return_value = mock_audio
+        mock_file.return_value = create_mock_audio(tags=None)
         
         process_audio_from_tags(audio_path, embed=True, write_file=False)
         
-        captured = capsys.readouterr()
-        assert "Skipping (no tags in file)" in captured.out
\ No newline at end of file
+        console.warn.assert_called_once_with("  Skipping (no tags in file)")
\ No newline at end of file
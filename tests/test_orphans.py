@@ -0,0 +1,505 @@
+"""
+Unit tests for mixcloud_orphans.py orphan track finder.
+"""
+
+import json
+import subprocess
+import sys
+import time
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+from unittest.mock import Mock, call, patch
+
+from mixcloud_orphans import (
+    download_orphans,
+    find_orphan_tracks,
+    iter_orphan_tracks,
+    main,
+    prefetch_track_info,
+)
+
+
+class TestFindOrphanTracks:
+    """Tests for find_orphan_tracks function."""
+
+    @patch('mixcloud_orphans.fetch_user_uploads')
+    @patch('mixcloud_orphans.fetch_playlist_items')
+    @patch('mixcloud_orphans.fetch_user_playlists')
+    def test_finds_uploads_not_in_playlists(self, mock_playlists, mock_items, mock_uploads):
+        """Uploads missing from every playlist are reported as orphans."""
+        mock_playlists.return_value = [
+            {'name': 'Playlist One', 'slug': 'playlist-one'},
+            {'name': 'Playlist Two', 'slug': 'playlist-two'},
+        ]
+        mock_items.side_effect = lambda username, slug: {
+            'playlist-one': [{'name': 'Mix A', 'slug': 'mix-a'}],
+            'playlist-two': [{'name': 'Mix B', 'slug': 'mix-b'}],
+        }[slug]
+        mock_uploads.return_value = [
+            {'name': 'Mix A', 'slug': 'mix-a'},
+            {'name': 'Mix B', 'slug': 'mix-b'},
+            {'name': 'Mix C', 'slug': 'mix-c'},
+        ]
+
+        all_uploads, orphans, playlist_slugs = find_orphan_tracks("testuser")
+
+        assert len(all_uploads) == 3
+        assert [o['slug'] for o in orphans] == ['mix-c']
+        assert orphans[0]['_url'] == "https://www.mixcloud.com/testuser/mix-c/"
+        assert playlist_slugs == {'mix-a', 'mix-b'}
+        assert mock_items.call_count == 2
+
+    @patch('mixcloud_orphans.fetch_user_uploads')
+    @patch('mixcloud_orphans.fetch_user_playlists')
+    def test_deduplicates_uploads_by_slug(self, mock_playlists, mock_uploads):
+        """An upload returned twice by the API is only reported once."""
+        mock_playlists.return_value = []
+        mock_uploads.return_value = [
+            {'name': 'Mix A', 'slug': 'mix-a'},
+            {'name': 'Mix B', 'slug': 'mix-b'},
+            {'name': 'Mix A', 'slug': 'mix-a'},
+        ]
+
+        all_uploads, orphans, _ = find_orphan_tracks("testuser")
+
+        assert len(all_uploads) == 2
+        assert [o['slug'] for o in orphans] == ['mix-a', 'mix-b']
+
+    @patch('mixcloud_orphans.fetch_user_uploads')
+    @patch('mixcloud_orphans.fetch_playlist_items')
+    @patch('mixcloud_orphans.fetch_user_playlists')
+    def test_ignores_failed_playlist_fetch(self, mock_playlists, mock_items, mock_uploads):
+        """A playlist whose items cannot be fetched contributes no slugs."""
+        mock_playlists.return_value = [{'name': 'Broken', 'slug': 'broken'}]
+        mock_items.return_value = None
+        mock_uploads.return_value = [{'name': 'Mix A', 'slug': 'mix-a'}]
+
+        _, orphans, playlist_slugs = find_orphan_tracks("testuser")
+
+        assert playlist_slugs == set()
+        assert [o['slug'] for o in orphans] == ['mix-a']
+
+    @patch('mixcloud_orphans.fetch_user_playlists')
+    def test_returns_none_when_playlists_fail(self, mock_playlists):
+        """Returns None when the playlist listing cannot be fetched."""
+        mock_playlists.return_value = None
+
+        assert find_orphan_tracks("testuser") is None
+
+    @patch('mixcloud_orphans.fetch_user_uploads')
+    @patch('mixcloud_orphans.fetch_user_playlists')
+    def test_returns_none_when_uploads_fail(self, mock_playlists, mock_uploads):
+        """Returns None when the upload listing cannot be fetched."""
+        mock_playlists.return_value = []
+        mock_uploads.return_value = None
+
+        assert find_orphan_tracks("testuser") is None
+
+
+@patch('mixcloud_orphans.fetch_user_uploads')
+@patch('mixcloud_orphans.fetch_playlist_items')
+@patch('mixcloud_orphans.fetch_user_playlists')
+class TestPlaylistCache:
+    """Tests for the on-disk playlist cache used by find_orphan_tracks."""
+
+    def test_writes_and_reuses_cache(self, mock_playlists, mock_items, mock_uploads, tmp_path):
+        """A second run within the TTL does not re-fetch playlist items."""
+        cache_path = tmp_path / "cache" / "playlists.json"
+        mock_playlists.return_value = [{'name': 'Playlist One', 'slug': 'playlist-one'}]
+        mock_items.return_value = [{'name': 'Mix A', 'slug': 'mix-a'}]
+        mock_uploads.return_value = [
+            {'name': 'Mix A', 'slug': 'mix-a'},
+            {'name': 'Mix B', 'slug': 'mix-b'},
+        ]
+
+        find_orphan_tracks("testuser", cache_path=cache_path, cache_ttl=3600)
+        _, orphans, _ = find_orphan_tracks("testuser", cache_path=cache_path, cache_ttl=3600)
+
+        assert mock_items.call_count == 1
+        assert [o['slug'] for o in orphans] == ['mix-b']
+        cache = json.loads(cache_path.read_text())
+        assert cache["testuser"]["playlist-one"]["slugs"] == ['mix-a']
+
+    def test_refetches_stale_entries(self, mock_playlists, mock_items, mock_uploads, tmp_path):
+        """Entries older than the TTL are fetched again."""
+        cache_path = tmp_path / "playlists.json"
+        cache_path.write_text(json.dumps({
+            "testuser": {"playlist-one": {"fetched_at": time.time() - 100, "slugs": ["old-mix"]}}
+        }))
+        mock_playlists.return_value = [{'name': 'Playlist One', 'slug': 'playlist-one'}]
+        mock_items.return_value = [{'name': 'Mix A', 'slug': 'mix-a'}]
+        mock_uploads.return_value = []
+
+        _, _, playlist_slugs = find_orphan_tracks("testuser", cache_path=cache_path, cache_ttl=10)
+
+        mock_items.assert_called_once_with("testuser", "playlist-one")
+        assert playlist_slugs == {'mix-a'}
+
+    def test_keeps_stale_entry_when_refetch_fails(self, mock_playlists, mock_items, mock_uploads, tmp_path):
+        """A failed re-fetch falls back to the expired slugs instead of dropping them."""
+        fetched_at = time.time() - 100
+        cache_path = tmp_path / "playlists.json"
+        cache_path.write_text(json.dumps({
+            "testuser": {"playlist-one": {"fetched_at": fetched_at, "slugs": ["mix-a"]}}
+        }))
+        mock_playlists.return_value = [{'name': 'Playlist One', 'slug': 'playlist-one'}]
+        mock_items.return_value = None
+        mock_uploads.return_value = [{'name': 'Mix A', 'slug': 'mix-a'}]
+
+        _, orphans, playlist_slugs = find_orphan_tracks("testuser", cache_path=cache_path, cache_ttl=10)
+
+        assert playlist_slugs == {'mix-a'}
+        assert orphans == []
+        # The old timestamp is kept so the next run retries the fetch
+        cache = json.loads(cache_path.read_text())
+        assert cache["testuser"]["playlist-one"]["fetched_at"] == fetched_at
+
+    def test_cache_not_reused_by_default(self, mock_playlists, mock_items, mock_uploads, tmp_path):
+        """Without a TTL every playlist is re-fetched, however fresh its entry."""
+        cache_path = tmp_path / "playlists.json"
+        cache_path.write_text(json.dumps({
+            "testuser": {"playlist-one": {"fetched_at": time.time(), "slugs": ["old-mix"]}}
+        }))
+        mock_playlists.return_value = [{'name': 'Playlist One', 'slug': 'playlist-one'}]
+        mock_items.return_value = [{'name': 'Mix A', 'slug': 'mix-a'}]
+        mock_uploads.return_value = []
+
+        _, _, playlist_slugs = find_orphan_tracks("testuser", cache_path=cache_path)
+
+        mock_items.assert_called_once_with("testuser", "playlist-one")
+        assert playlist_slugs == {'mix-a'}
+
+    def test_failed_fetch_ignores_cache_by_default(self, mock_playlists, mock_items, mock_uploads, tmp_path):
+        """Without a TTL a failed fetch warns instead of using cached items."""
+        cache_path = tmp_path / "playlists.json"
+        cache_path.write_text(json.dumps({
+            "testuser": {"playlist-one": {"fetched_at": time.time(), "slugs": ["mix-a"]}}
+        }))
+        mock_playlists.return_value = [{'name': 'Playlist One', 'slug': 'playlist-one'}]
+        mock_items.return_value = None
+        mock_uploads.return_value = [{'name': 'Mix A', 'slug': 'mix-a'}]
+        console = Mock()
+
+        with patch('mixcloud_orphans.get_console', return_value=console):
+            _, orphans, playlist_slugs = find_orphan_tracks("testuser", cache_path=cache_path)
+
+        assert playlist_slugs == frozenset()
+        assert [o['slug'] for o in orphans] == ['mix-a']
+        console.warn.assert_called_once_with(
+            "  Warning: Could not fetch items; tracks in 'Playlist One' may be listed as orphans"
+        )
+
+    def test_drops_deleted_playlists(self, mock_playlists, mock_items, mock_uploads, tmp_path):
+        """Cached playlists that no longer exist are removed from the cache."""
+        cache_path = tmp_path / "playlists.json"
+        cache_path.write_text(json.dumps({
+            "testuser": {"deleted": {"fetched_at": time.time(), "slugs": ["mix-x"]}}
+        }))
+        mock_playlists.return_value = []
+        mock_uploads.return_value = [{'name': 'Mix X', 'slug': 'mix-x'}]
+
+        _, orphans, _ = find_orphan_tracks("testuser", cache_path=cache_path)
+
+        assert [o['slug'] for o in orphans] == ['mix-x']
+        assert json.loads(cache_path.read_text()) == {"testuser": {}}
+        mock_items.assert_not_called()
+
+    def test_ignores_corrupt_cache(self, mock_playlists, mock_items, mock_uploads, tmp_path):
+        """An unreadable cache file is treated as empty."""
+        cache_path = tmp_path / "playlists.json"
+        cache_path.write_text("not json")
+        mock_playlists.return_value = [{'name': 'Playlist One', 'slug': 'playlist-one'}]
+        mock_items.return_value = [{'name': 'Mix A', 'slug': 'mix-a'}]
+        mock_uploads.return_value = []
+
+        _, _, playlist_slugs = find_orphan_tracks("testuser", cache_path=cache_path)
+
+        assert playlist_slugs == {'mix-a'}
+        mock_items.assert_called_once()
+
+
+class TestIterOrphanTracks:
+    """Tests for the streaming iter_orphan_tracks generator."""
+
+    @patch('mixcloud_orphans.iter_user_upload_pages')
+    def test_yields_orphans_across_pages(self, mock_pages):
+        """Orphans from every page are yielded in upload order."""
+        mock_pages.return_value = iter([
+            [{'name': 'Mix A', 'slug': 'mix-a'}, {'name': 'Mix B', 'slug': 'mix-b'}],
+            [{'name': 'Mix C', 'slug': 'mix-c'}],
+        ])
+
+        orphans = list(iter_orphan_tracks("testuser", frozenset({'mix-b'})))
+
+        assert [o['slug'] for o in orphans] == ['mix-a', 'mix-c']
+        assert [o['_url'] for o in orphans] == [
+            "https://www.mixcloud.com/testuser/mix-a/",
+            "https://www.mixcloud.com/testuser/mix-c/",
+        ]
+
+    @patch('mixcloud_orphans.iter_user_upload_pages')
+    def test_skips_duplicates_across_pages(self, mock_pages):
+        """An upload repeated on an overlapping page is yielded once."""
+        mock_pages.return_value = iter([
+            [{'name': 'Mix A', 'slug': 'mix-a'}],
+            [{'name': 'Mix A', 'slug': 'mix-a'}, {'name': 'Mix B', 'slug': 'mix-b'}],
+        ])
+
+        orphans = list(iter_orphan_tracks("testuser", frozenset()))
+
+        assert [o['slug'] for o in orphans] == ['mix-a', 'mix-b']
+
+    @patch('mixcloud_orphans.iter_user_upload_pages')
+    def test_counts_uploads_and_orphans(self, mock_pages):
+        """The optional counts dict totals unique uploads and yielded orphans."""
+        mock_pages.return_value = iter([
+            [{'name': 'Mix A', 'slug': 'mix-a'}, {'name': 'Mix B', 'slug': 'mix-b'}],
+            [{'name': 'Mix B', 'slug': 'mix-b'}, {'name': 'Mix C', 'slug': 'mix-c'}],
+        ])
+        counts = {}
+
+        list(iter_orphan_tracks("testuser", frozenset({'mix-b'}), counts))
+
+        assert counts == {'uploads': 3, 'orphans': 2}
+
+    @patch('mixcloud_orphans.iter_user_upload_pages')
+    def test_yields_before_next_page_is_fetched(self, mock_pages):
+        """The first orphan is available before later pages are requested."""
+        pages_fetched = []
+
+        def pages(username):
+            pages_fetched.append(1)
+            yield [{'name': 'Mix A', 'slug': 'mix-a'}]
+            pages_fetched.append(2)
+            yield [{'name': 'Mix B', 'slug': 'mix-b'}]
+
+        mock_pages.side_effect = pages
+
+        first = next(iter_orphan_tracks("testuser", frozenset()))
+
+        assert first['slug'] == 'mix-a'
+        assert pages_fetched == [1]
+
+
+class TestPrefetchTrackInfo:
+    """Tests for prefetch_track_info look-ahead helper."""
+
+    def test_yields_info_in_url_order(self):
+        """Results come back in input order paired with their track and URL."""
+        urls = [f"https://www.mixcloud.com/user/mix-{i}/" for i in range(10)]
+        items = [({'slug': f"mix-{i}"}, url) for i, url in enumerate(urls)]
+
+        results = list(prefetch_track_info(items, lambda url: {'url': url}, ahead=3))
+
+        assert [url for _, url, _, _ in results] == urls
+        assert [track for track, _, _, _ in results] == [track for track, _ in items]
+        assert all(info == {'url': url} for _, url, info, _ in results)
+
+    def test_passes_through_none_info(self):
+        """Failed lookups (None) are yielded rather than dropped."""
+        results = list(prefetch_track_info([("t1", "a"), ("t2", "b")], lambda url: None))
+
+        assert [result[:3] for result in results] == [("t1", "a", None), ("t2", "b", None)]
+
+    def test_consumes_lazy_input(self):
+        """A generator input is only advanced as far as the look-ahead needs."""
+        consumed = []
+
+        def items():
+            for i in range(10):
+                consumed.append(i)
+                yield i, f"url-{i}"
+
+        prefetched = prefetch_track_info(items(), lambda url: url, ahead=2)
+        next(prefetched)
+
+        assert consumed == [0, 1, 2]
+
+    def test_empty_input(self):
+        """No tracks yields nothing."""
+        assert list(prefetch_track_info([], lambda url: url)) == []
+
+
+class TestDownloadOrphans:
+    """Tests for the download_orphans download loop."""
+
+    def _args(self, tmp_path):
+        return Namespace(
+            username="testuser", output=tmp_path, archive=tmp_path / "archive.txt",
+            to_mp3=False, no_embed=False, write_lrc=False,
+        )
+
+    @patch('mixcloud_match_to_lrc.process_audio_with_url')
+    @patch('mixcloud_downloader.download_track')
+    @patch('mixcloud_downloader.fetch_track_info')
+    def test_processes_tracklists_for_downloads(self, mock_info, mock_download, mock_process, tmp_path):
+        """Every downloaded track gets its tracklist processed, errors included."""
+        files = [tmp_path / "a.m4a", tmp_path / "b.m4a"]
+        for f in files:
+            f.touch()
+        mock_info.return_value = None
+        mock_download.side_effect = files
+        mock_process.side_effect = [None, RuntimeError("boom")]
+        tracks = [
+            {'name': 'Mix A', 'slug': 'mix-a', '_url': "https://www.mixcloud.com/testuser/mix-a/"},
+            {'name': 'Mix B', 'slug': 'mix-b', '_url': "https://www.mixcloud.com/testuser/mix-b/"},
+        ]
+
+        assert download_orphans(iter(tracks), self._args(tmp_path)) is True
+
+        assert sorted(c.args[0] for c in mock_process.call_args_list) == files
+
+    @patch('mixcloud_match_to_lrc.process_audio_with_url')
+    @patch('mixcloud_downloader.download_track')
+    @patch('mixcloud_downloader.fetch_track_info')
+    def test_shared_file_is_processed_once(self, mock_info, mock_download, mock_process, tmp_path):
+        """Two orphans resolving to the same file queue a single tracklist job."""
+        shared = tmp_path / "a.m4a"
+        shared.touch()
+        mock_info.return_value = None
+        mock_download.return_value = shared
+        tracks = [
+            {'name': 'Mix A', 'slug': 'mix-a', '_url': "https://www.mixcloud.com/testuser/mix-a/"},
+            {'name': 'Mix B', 'slug': 'mix-b', '_url': "https://www.mixcloud.com/testuser/mix-b/"},
+        ]
+
+        assert download_orphans(iter(tracks), self._args(tmp_path)) is True
+
+        mock_process.assert_called_once()
+
+    @patch('mixcloud_match_to_lrc.process_audio_with_url')
+    @patch('mixcloud_downloader.download_track')
+    @patch('mixcloud_downloader.fetch_track_info')
+    def test_job_output_is_printed_under_file_name(self, mock_info, mock_download, mock_process, tmp_path):
+        """Background job output is printed as one block headed by its file name."""
+        from console import get_console
+
+        path = tmp_path / "a.m4a"
+        path.touch()
+        mock_info.return_value = None
+        mock_download.return_value = path
+        mock_process.side_effect = lambda *args, **kwargs: get_console().success("  ✓ embedded (2 tracks)")
+        console = Mock()
+        tracks = [{'name': 'Mix A', 'slug': 'mix-a', '_url': "https://www.mixcloud.com/testuser/mix-a/"}]
+
+        with patch('mixcloud_orphans.get_console', return_value=console):
+            download_orphans(iter(tracks), self._args(tmp_path))
+
+        calls = console.mock_calls
+        header = calls.index(call.print("Tracklist: a.m4a"))
+        assert calls[header + 1] == call.success("  ✓ embedded (2 tracks)")
+
+    @patch('mixcloud_downloader.close_extraction_ydls')
+    @patch('mixcloud_downloader.download_track')
+    @patch('mixcloud_downloader.fetch_track_info')
+    def test_closes_cached_youtubedl_instances(self, mock_info, mock_download, mock_close, tmp_path):
+        """The prefetch workers' YoutubeDL instances are closed once downloads end."""
+        mock_info.return_value = None
+        mock_download.return_value = None
+        tracks = [{'name': 'Mix A', 'slug': 'mix-a', '_url': "https://www.mixcloud.com/testuser/mix-a/"}]
+
+        download_orphans(iter(tracks), self._args(tmp_path))
+
+        mock_close.assert_called_once_with()
+
+    @patch('mixcloud_downloader.download_track')
+    @patch('mixcloud_downloader.fetch_track_info')
+    def test_prefetch_warning_printed_under_its_track(self, mock_info, mock_download, tmp_path):
+        """A warning from a look-ahead fetch is shown under that track's header."""
+        from console import get_console
+
+        def fetch(url):
+            if "mix-b" in url:
+                get_console().warn("  Warning: Could not fetch track info: boom")
+                return None
+            return {'title': 'Mix A'}
+
+        mock_info.side_effect = fetch
+        mock_download.return_value = None
+        console = Mock()
+        tracks = [
+            {'name': 'Mix A', 'slug': 'mix-a', '_url': "https://www.mixcloud.com/testuser/mix-a/"},
+            {'name': 'Mix B', 'slug': 'mix-b', '_url': "https://www.mixcloud.com/testuser/mix-b/"},
+        ]
+
+        with patch('mixcloud_orphans.get_console', return_value=console):
+            download_orphans(iter(tracks), self._args(tmp_path))
+
+        calls = console.mock_calls
+        warning = calls.index(call.warn("  Warning: Could not fetch track info: boom"))
+        assert calls.index(call.print("[2] Mix B")) == warning - 1
+
+    @patch('mixcloud_match_to_lrc.process_audio_with_url')
+    @patch('mixcloud_downloader.download_track')
+    @patch('mixcloud_downloader.fetch_track_info')
+    def test_reports_api_error_mid_stream(self, mock_info, mock_download, mock_process, tmp_path):
+        """An API error while paginating stops the loop and returns False."""
+        from mixcloud_common import MixcloudAPIError
+
+        def tracks():
+            yield {'name': 'Mix A', 'slug': 'mix-a', '_url': "https://www.mixcloud.com/testuser/mix-a/"}
+            raise MixcloudAPIError("API error: HTTP 500")
+
+        mock_info.return_value = None
+        mock_download.return_value = None
+
+        assert download_orphans(tracks(), self._args(tmp_path)) is False
+        mock_download.assert_called_once()
+
+
+class TestMainDownload:
+    """Tests for main() in --download mode."""
+
+    @pytest.fixture
+    def console(self):
+        """Record main()'s console output without configuring a real console."""
+        console = Mock()
+        with patch('mixcloud_orphans.get_console', return_value=console), \
+                patch('mixcloud_orphans.configure_console'):
+            yield console
+
+    def _run(self, uploads):
+        def consume(orphans, args):
+            list(orphans)
+            return True
+
+        with patch.object(sys, 'argv', ['mixcloud_orphans.py', 'testuser', '--download']), \
+                patch('mixcloud_orphans.collect_playlist_slugs', return_value=frozenset({'mix-a'})), \
+                patch('mixcloud_orphans.iter_user_upload_pages', return_value=iter([uploads])), \
+                patch('mixcloud_orphans.download_orphans', side_effect=consume):
+            main()
+
+    def test_prints_summary_after_download(self, console):
+        """Totals counted while streaming are shown once the downloads finish."""
+        self._run([{'name': 'Mix A', 'slug': 'mix-a'}, {'name': 'Mix B', 'slug': 'mix-b'}])
+
+        console.summary_table.assert_any_call(
+            "Summary",
+            [("Total uploads", "2"), ("In playlists", "1"), ("Orphans", "1")],
+        )
+
+    def test_reports_no_orphans(self, console):
+        """A download run with nothing to fetch says so."""
+        self._run([{'name': 'Mix A', 'slug': 'mix-a'}])
+
+        console.info.assert_any_call("No orphan tracks found - all uploads are in playlists!")
+
+
+class TestLazyImports:
+    """The listing path must not pull in the download/tagging stack."""
+
+    def test_import_skips_downloader_dependencies(self):
+        """Importing the module leaves yt-dlp and mutagen unloaded."""
+        src_dir = Path(__file__).resolve().parent.parent / "src"
+        code = (
+            "import sys, mixcloud_orphans; "
+            "print(sorted(m for m in ('yt_dlp', 'mutagen', 'mixcloud_downloader') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=src_dir, capture_output=True, text=True, check=True,
+        )
+
+        assert result.stdout.strip() == "[]"
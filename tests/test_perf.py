@@ -0,0 +1,39 @@
+"""
+Micro-benchmarks for hot helpers in mixcloud_common.py.
+
+Requires pytest-benchmark; the module is skipped when it isn't installed.
+No timing thresholds are asserted - compare runs with --benchmark-compare.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from mixcloud_common import extract_lookup, format_lrc_timestamp
+
+
+URL_CORPUS = [
+    "https://www.mixcloud.com/DJ_Example/cool-mix-2024/",
+    "https://www.mixcloud.com/Glastonauts_Live/fat-tez-%C3%A6lfgifu/",
+    "http://mixcloud.com/user/mix",
+    "https://www.mixcloud.com/user/my%20cool%20mix/",
+    "https://soundcloud.com/user/mix",
+] * 200
+
+TIMESTAMP_CORPUS = [i * 7.31 for i in range(1000)]
+
+
+@pytest.mark.benchmark(group="url")
+def test_extract_lookup_perf(benchmark):
+    """Parse a fixed corpus of Mixcloud and non-Mixcloud URLs."""
+    # Bypass the lru_cache so the parser itself is measured
+    parse = extract_lookup.__wrapped__
+    results = benchmark(lambda: [parse(url) for url in URL_CORPUS])
+    assert len(results) == len(URL_CORPUS)
+
+
+@pytest.mark.benchmark(group="lrc")
+def test_format_lrc_timestamp_perf(benchmark):
+    """Format a spread of timestamps up to about two hours."""
+    results = benchmark(lambda: [format_lrc_timestamp(t) for t in TIMESTAMP_CORPUS])
+    assert len(results) == len(TIMESTAMP_CORPUS)